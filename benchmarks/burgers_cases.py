@@ -0,0 +1,73 @@
+"""
+Benchmark cases of the Burgers' solver in `w7/burgers_eqn`. Run by `suite.py` in its own process, since the packages of the solvers have the same names. Prints the results as JSON.
+
+A size `[M, Nx]` is a batch of `M` random initial profiles on `Nx` cells. The batched stepper is compared against stepping the profiles one at a time.
+
+"""
+import argparse
+import json
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w7', 'burgers_eqn'))
+
+from harness import measure
+from data.grid import sGrid, tGrid
+from input.user_data import UserDataInit
+from numerics.lax_friedrichs import lax_friedrichs, LaxFriedrichs
+from numerics.bc import set_boundary
+from numerics.cfl import AdaptiveTimeStep
+from input import random
+
+
+def user_data(M, Nx):
+    ud = UserDataInit(**vars(random.UserData()))
+    ud.members, ud.Nx = M, Nx
+    return ud
+
+
+def run_cases(sizes, steps):
+    results = {}
+    for M, Nx in sizes:
+        tag = '[%ix%i]' % (M, Nx)
+        cells = M * Nx
+        ud = user_data(M, Nx)
+        sg = sGrid(ud)
+        tg = tGrid(ud)
+        sol = random.sol_init(sg, ud, np.random.RandomState(0))
+        # stable for all profiles, whose largest speed does not grow
+        tg.dt = 0.5 * sg.dx / np.abs(sol.u).max()
+
+        def reference():
+            lax_friedrichs(sol, tg, sg, ud)
+            set_boundary(sol, ud.bc)
+        results['burgers.lax_friedrichs' + tag] = measure(reference, calls=steps, cells=cells)
+
+        stepper = LaxFriedrichs(sg, ud, sol.u.shape)
+        results['burgers.LaxFriedrichs' + tag] = measure(lambda: stepper(sol, tg, sg, ud), calls=steps, cells=cells)
+
+        adaptive_dt = AdaptiveTimeStep(sg, ud, sol.u.shape)
+        remaining = np.full(sol.u.shape[:-1] + (1,), ud.T)
+        results['burgers.AdaptiveTimeStep' + tag] = measure(lambda: adaptive_dt(sol, sg, ud, remaining), calls=steps, cells=cells)
+
+        if M > 1:
+            # the profiles one at a time, as in a loop over the notebook
+            ud_one = user_data(1, Nx)
+            members = [random.sol_init(sg, ud_one, np.random.RandomState(m)) for m in range(M)]
+            stepper_one = LaxFriedrichs(sg, ud_one, members[0].u.shape)
+            def loop():
+                for member in members:
+                    stepper_one(member, tg, sg, ud_one)
+            results['burgers.LaxFriedrichs.loop' + tag] = measure(loop, calls=max(1, steps // 10), cells=cells)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=json.loads, default=[[1, 1793], [64, 1793], [256, 1793]])
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+
+    print(json.dumps(run_cases(args.sizes, args.steps)))
@@ -0,0 +1,58 @@
+"""
+Timing of the convergence study engine in `w3/convergence` against the loop of the week 3 notebook, which runs `euler_b` serially for every step size and stores the whole trajectories:
+
+    python benchmarks/convergence_study.py [-n STEPS] [-j WORKERS]
+
+The engine is timed vectorised over all step sizes with the powers of the step matrix, and stepping one step size per process of a pool. The observed orders and the largest difference of the errors against the notebook are reported.
+
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w3', 'convergence'))
+
+from steppers import euler_b
+from study import convergence_study, fit_order
+
+
+def notebook(dts, Nt):
+    # the loop of w3/orders_and_errors_soln.ipynb
+    err = []
+    for dt in dts:
+        xb = np.zeros((Nt+1))
+        vb = np.zeros((Nt+1))
+        vb[0] = 1.0
+        for idx in range(Nt):
+            vb[idx+1] = vb[idx] - dt * xb[idx]
+            xb[idx+1] = xb[idx] + dt * vb[idx+1]
+        energy = 0.5 * xb**2 + 0.5 * vb**2
+
+        t = np.arange(Nt+1)*dt
+        eth = 0.5 * np.sin(t)**2 + 0.5 * np.cos(t)**2
+        err.append(np.abs(energy - eth).max())
+    return np.array(err)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Timing of the convergence study engine against the notebook loop')
+    parser.add_argument('-n', '--steps', type=int, default=100000, help='Number of time-steps of every step size')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='Number of processes of the pool')
+    args = parser.parse_args()
+
+    dts = np.array([1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1])
+
+    tic = time.perf_counter()
+    reference = notebook(dts, args.steps)
+    runs = {'notebook' : (time.perf_counter() - tic, fit_order(dts, reference)[0], reference)}
+
+    for name, linear, workers in (('vectorised', True, 1), ('pool', False, args.workers)):
+        result = convergence_study(euler_b, dts, args.steps, linear=linear, workers=workers)
+        runs[name] = (result.wall_time, fit_order(dts, result.errors)[0], result.errors)
+
+    print("euler_b, %i step sizes, %i steps each" % (len(dts), args.steps))
+    print("%12s %10s %10s %10s %14s" % ('', 'time [s]', 'speed-up', 'order', 'max|err diff|'))
+    for name, (wall_time, order, errors) in runs.items():
+        print("%12s %10.3f %10.1f %10.3f %14.3e" % (name, wall_time, runs['notebook'][0] / wall_time, order, np.max(np.abs(errors - reference))))
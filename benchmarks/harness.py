@@ -0,0 +1,94 @@
+"""
+Timing and memory measurements for the benchmark suite, and the comparison of results against a baseline.
+
+"""
+import gc
+import json
+import platform
+import time
+import tracemalloc
+
+
+def measure(func, calls=1, repeat=3, steps=1, cells=1):
+    """
+    Times `func`, which does `steps` time-steps on a grid of `cells` cells per call. The best of `repeat` runs of `calls` calls each is taken. The peak memory allocated during one call is measured in a separate, traced call.
+
+    Returns
+    -------
+    dict with the time per call in seconds, steps/second, cells/second and the peak memory in MiB
+
+    """
+    func()
+
+    best = float('inf')
+    for rr in range(repeat):
+        gc.collect()
+        tic = time.perf_counter()
+        for cc in range(calls):
+            func()
+        best = min(best, (time.perf_counter() - tic) / calls)
+
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'time': best,
+        'steps_per_s': steps / best,
+        'cells_per_s': steps * cells / best,
+        'peak_mem_mib': peak / 2.0**20,
+    }
+
+
+def metadata():
+    import numpy as np
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'node': platform.node(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def save(results, path):
+    with open(path, 'w') as file:
+        json.dump({'meta': metadata(), 'results': results}, file, indent=2, sort_keys=True)
+
+
+def load(path):
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare(results, baseline, tolerance=0.1):
+    """
+    Compares the time per call of every benchmark against `baseline`. Benchmarks that are slower by more than the relative `tolerance` are regressions.
+
+    Returns
+    -------
+    list of (name, ratio) of the regressions
+
+    """
+    regressions = []
+    print("%-45s %12s %12s %8s" % ('benchmark', 'baseline', 'current', 'ratio'))
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        old, new = baseline[name]['time'], results[name]['time']
+        ratio = new / old
+        flag = ' <-- regression' if ratio > 1.0 + tolerance else ''
+        print("%-45s %10.3fms %10.3fms %8.2f%s" % (name, old * 1e3, new * 1e3, ratio, flag))
+        if flag:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def report(results):
+    print("%-45s %12s %12s %14s %10s" % ('benchmark', 'time/call', 'steps/s', 'cells/s', 'peak MiB'))
+    for name in sorted(results):
+        res = results[name]
+        print("%-45s %10.3fms %12.1f %14.3e %10.2f" % (name, res['time'] * 1e3, res['steps_per_s'], res['cells_per_s'], res['peak_mem_mib']))
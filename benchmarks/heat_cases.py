@@ -0,0 +1,72 @@
+"""
+Benchmark cases of the heat equation solver in `w9/heat_eqn`. Run by `suite.py` in its own process, since the packages of `w12/swe` and `w9/heat_eqn` have the same names. Prints the results as JSON.
+
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w9', 'heat_eqn'))
+
+from harness import measure
+from data import io
+from data.grid import sGrid, tGrid
+from numerics.ctr_diff import rhs
+from numerics.laplacian import Laplacian
+from numerics import adi, expl_mdpt
+from input import gauss
+
+
+def user_data(N, steps=1):
+    ud = gauss.UserData()
+    dx = (ud.xmax - ud.xmin) / (N - 1)
+    # keep the diffusion number of the default resolution
+    ud.dt = ud.dt * (dx / 0.1)**2
+    ud.Nx, ud.Ny = N, N
+    ud.T = (steps - 1) * ud.dt
+    return ud
+
+
+def run_cases(sizes, steps, tmp):
+    results = {}
+    for N in sizes:
+        tag = '[%ix%i]' % (N, N)
+        cells = N * N
+        ud = user_data(N)
+        sg = sGrid(ud)
+        sol = gauss.sol_init(sg)
+        results['heat.ctr_diff.rhs' + tag] = measure(lambda: rhs(sol, sg.dxy), calls=steps, cells=cells)
+        laplacian = Laplacian(sol.u.shape, sg.dxy)
+        results['heat.laplacian' + tag] = measure(lambda: laplacian(sol.u, sol.fu), calls=steps, cells=cells)
+
+        ud = user_data(N, steps)
+        sg = sGrid(ud)
+        tg = tGrid(ud)
+        for scheme in (expl_mdpt, adi):
+            def run():
+                out = io.writer(folder=tmp, filename='bench_heat.h5')
+                sol = gauss.sol_init(sg)
+                scheme.time_update(sol, tg, sg, out)
+            name = scheme.__name__.split('.')[-1]
+            results['heat.%s.time_update' %name + tag] = measure(run, repeat=1, steps=len(tg.t), cells=cells)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=json.loads, default=[41, 81, 161])
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # tqdm prints the progress to stderr
+        stderr = sys.stderr
+        sys.stderr = open(os.devnull, 'w')
+        results = run_cases(args.sizes, args.steps, tmp)
+        sys.stderr = stderr
+
+    print(json.dumps(results))
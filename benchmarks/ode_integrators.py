@@ -0,0 +1,67 @@
+"""
+Timing of the batched ODE integrators in `w2/integrators` for a phase-space sweep of the Lotka-Volterra model over a grid of `(baboons_gain, cheetahs_loss)`, against the scalar loop of the week 2 notebook run once per combination:
+
+    python benchmarks/ode_integrators.py [-n SIZE] [--steps STEPS] [--every EVERY] [--scheme stormer_verlet]
+
+The notebook loop is timed on a few combinations and extrapolated to the whole grid. The JIT-compiled loop is timed with and without its compilation, and its results are compared against the NumPy loop.
+
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w2', 'integrators'))
+
+from integrate import integrate, get_grid, numba
+from models import LOTKA_VOLTERRA
+
+
+def notebook(dt, Nt, baboons_gain, cheetahs_loss, baboons_loss=0.4, cheetahs_gain=0.1):
+    # the loop of w2/lotka-volterra.ipynb
+    baboons = np.zeros((Nt+1))
+    cheetahs = np.zeros((Nt+1))
+    baboons[0] = 10.0
+    cheetahs[0] = 10.0
+    for idx in range(Nt):
+        cheetahs[idx+1] = cheetahs[idx] + 0.5 * dt * (cheetahs_gain * baboons[idx] * cheetahs[idx] - cheetahs_loss * cheetahs[idx])
+        baboons[idx+1] = baboons[idx] + dt * (baboons_gain * baboons[idx] - baboons_loss * baboons[idx] * cheetahs[idx+1])
+        cheetahs[idx+1] = cheetahs[idx+1] + 0.5 * dt * (cheetahs_gain * baboons[idx+1] * cheetahs[idx+1] - cheetahs_loss * cheetahs[idx+1])
+    return baboons, cheetahs
+
+
+def timed(func, *args, **kwargs):
+    tic = time.perf_counter()
+    out = func(*args, **kwargs)
+    return time.perf_counter() - tic, out
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Timing of the batched ODE integrators for a Lotka-Volterra sweep')
+    parser.add_argument('-n', '--size', type=int, default=64, help='Number of values of each of the two parameters')
+    parser.add_argument('--steps', type=int, default=10000, help='Number of time-steps')
+    parser.add_argument('--every', type=int, default=100, help='Keep every this many steps')
+    parser.add_argument('--scheme', default='stormer_verlet', help='Scheme of the integrators')
+    args = parser.parse_args()
+
+    dt = 0.01
+    grid = get_grid(LOTKA_VOLTERRA, {'baboons_gain' : np.linspace(0.5, 1.5, args.size), 'cheetahs_loss' : np.linspace(0.2, 0.6, args.size)})
+    members = args.size**2
+    print("%i combinations, %i steps, every %i-th kept, %s" % (members, args.steps, args.every, args.scheme))
+
+    runs = {}
+    if args.scheme == 'stormer_verlet':
+        sample = 8
+        wall_time, _ = timed(lambda: [notebook(dt, args.steps, 1.1, 0.4) for nn in range(sample)])
+        runs['notebook (est.)'] = wall_time / sample * members
+
+    runs['numpy'], (t, ref) = timed(integrate, LOTKA_VOLTERRA, args.scheme, dt, args.steps, grid, every=args.every)
+    if numba is not None:
+        runs['jit, first call'], _ = timed(integrate, LOTKA_VOLTERRA, args.scheme, dt, args.steps, grid, every=args.every, jit=True)
+        runs['jit'], (t, out) = timed(integrate, LOTKA_VOLTERRA, args.scheme, dt, args.steps, grid, every=args.every, jit=True)
+        print("max difference jit - numpy: %.3e" % max(np.max(np.abs(out[key] - ref[key])) for key in ref))
+
+    print("%18s %10s %14s" % ('', 'time [s]', 'member-steps/s'))
+    for name, wall_time in runs.items():
+        print("%18s %10.3f %14.3e" % (name, wall_time, members * args.steps / wall_time))
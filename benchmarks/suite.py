@@ -0,0 +1,53 @@
+"""
+Benchmark suite for the numerics kernels and the time loops of the shallow water solver (`w12/swe`), the heat equation solver (`w9/heat_eqn`) and the Burgers' solver (`w7/burgers_eqn`):
+
+    python benchmarks/suite.py [--quick] [-o results.json] [--baseline baseline.json] [--tolerance 0.1]
+
+Reports the time per call, steps/second, cells/second and peak memory of every benchmark. With `--baseline`, the results are compared against a previous run and the exit code is 1 if any benchmark is slower by more than the tolerance.
+
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import harness
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_cases(script, sizes, steps):
+    # every solver runs in its own process, as all have top-level packages named `data` and `numerics`
+    cmd = [sys.executable, os.path.join(HERE, script), '--sizes', json.dumps(sizes), '--steps', str(steps)]
+    out = subprocess.run(cmd, check=True, stdout=subprocess.PIPE, cwd=HERE, text=True).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark suite for the numerics kernels and time loops')
+    parser.add_argument('--quick', action='store_true', help='Run the small grid sizes only')
+    parser.add_argument('--steps', type=int, default=50, help='Number of time-steps per benchmark')
+    parser.add_argument('-o', '--output', default='benchmark_results.json', help='JSON file the results are written to')
+    parser.add_argument('--baseline', default=None, help='JSON file of a previous run to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.1, help='Relative slow-down that counts as a regression')
+    args = parser.parse_args()
+
+    swe_sizes = [[64, 16], [254, 50]] if args.quick else [[64, 16], [254, 50], [1016, 200]]
+    heat_sizes = [41, 81] if args.quick else [41, 81, 161]
+    burgers_sizes = [[1, 1793], [64, 1793]] if args.quick else [[1, 1793], [64, 1793], [256, 1793]]
+
+    results = {}
+    results.update(run_cases('swe_cases.py', swe_sizes, args.steps))
+    results.update(run_cases('heat_cases.py', heat_sizes, args.steps))
+    results.update(run_cases('burgers_cases.py', burgers_sizes, args.steps))
+
+    harness.report(results)
+    harness.save(results, args.output)
+    print("results written to %s" % args.output)
+
+    if args.baseline is not None:
+        regressions = harness.compare(results, harness.load(args.baseline), args.tolerance)
+        if regressions:
+            print("%i benchmark(s) slower than the baseline" % len(regressions))
+            sys.exit(1)
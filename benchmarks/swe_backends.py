@@ -0,0 +1,71 @@
+"""
+Compares the time-steppers of the shallow water solver in `w12/swe` on the `bin` and `gw` cases:
+
+    python benchmarks/swe_backends.py [-n STEPS]
+
+The reference is the `lax_wendroff` function followed by `set_boundary`.
+
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w12', 'swe'))
+
+from data.grid import sGrid, tGrid
+from numerics.lax_wendroff import lax_wendroff, LaxWendroff, get_stepper
+from numerics.bc import set_boundary
+from numerics import lax_wendroff_jit
+
+
+def reference(sol, tg, sg, ud):
+    lax_wendroff(sol, tg, sg, ud)
+    set_boundary(sol)
+
+
+def time_stepper(stepper, sol, tg, sg, ud, steps):
+    # one step to compile / warm up, then the timed steps
+    stepper(copy.deepcopy(sol), tg, sg, ud)
+    tic = time.perf_counter()
+    for nn in range(steps):
+        stepper(sol, tg, sg, ud)
+    return (time.perf_counter() - tic) / steps
+
+
+def max_diff(a, b):
+    return max(np.max(np.abs(getattr(a, key) - getattr(b, key))) for key in ('h', 'u', 'v'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark of the shallow water time-steppers')
+    parser.add_argument('-n', '--steps', type=int, default=200, help='Number of time-steps per case')
+    args = parser.parse_args()
+
+    from input import baroclinic_instability, gw
+    cases = {'bin': baroclinic_instability, 'gw': gw}
+
+    print("%-5s %-10s %12s %10s %12s" % ('case', 'backend', 'ms/step', 'speedup', 'max|diff|'))
+    for name, case in cases.items():
+        ud = case.UserData()
+        sg = sGrid(ud)
+        tg = tGrid(ud)
+        np.random.seed(0)
+        sol0 = case.sol_init(sg, ud)
+
+        steppers = {'reference': reference, 'numpy': LaxWendroff(sg)}
+        if lax_wendroff_jit.numba is not None:
+            steppers['numba'] = get_stepper(sg, 'numba')
+        else:
+            print("numba is not installed, skipping the numba backend")
+
+        results = {}
+        for backend, stepper in steppers.items():
+            sol = copy.deepcopy(sol0)
+            results[backend] = (time_stepper(stepper, sol, tg, sg, ud, args.steps), sol)
+
+        t_ref, sol_ref = results['reference']
+        for backend, (t_step, sol) in results.items():
+            print("%-5s %-10s %12.3f %10.2f %12.3e" % (name, backend, t_step * 1e3, t_ref / t_step, max_diff(sol_ref, sol)))
@@ -0,0 +1,85 @@
+"""
+Benchmark cases of the shallow water solver in `w12/swe`. Run by `suite.py` in its own process, since the packages of `w12/swe` and `w9/heat_eqn` have the same names. Prints the results as JSON.
+
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w12', 'swe'))
+
+from harness import measure
+from data import io
+from data.grid import sGrid, tGrid
+from numerics.lax_wendroff import lax_wendroff, LaxWendroff, get_stepper
+from numerics.bc import set_boundary
+from numerics import lax_wendroff_jit
+from input import baroclinic_instability
+import main
+
+
+def user_data(Nx, Ny, steps=1):
+    ud = baroclinic_instability.UserData()
+    # keep the CFL number of the default resolution
+    ud.dt = ud.dt * 254.0 / Nx
+    ud.Nx, ud.Ny = Nx, Ny
+    ud.T = steps * ud.dt
+    return ud
+
+
+def run_cases(sizes, steps, tmp):
+    results = {}
+    for Nx, Ny in sizes:
+        tag = '[%ix%i]' % (Nx, Ny)
+        cells = Nx * Ny
+        ud = user_data(Nx, Ny)
+        sg = sGrid(ud)
+        tg = tGrid(ud)
+        np.random.seed(0)
+        sol = baroclinic_instability.sol_init(sg, ud)
+
+        def reference():
+            lax_wendroff(sol, tg, sg, ud)
+            set_boundary(sol)
+        results['swe.lax_wendroff' + tag] = measure(reference, calls=steps, cells=cells)
+
+        stepper = LaxWendroff(sg)
+        results['swe.LaxWendroff' + tag] = measure(lambda: stepper(sol, tg, sg, ud), calls=steps, cells=cells)
+
+        if lax_wendroff_jit.numba is not None:
+            stepper_jit = get_stepper(sg, 'numba')
+            results['swe.LaxWendroffJit' + tag] = measure(lambda: stepper_jit(sol, tg, sg, ud), calls=steps, cells=cells)
+
+        results['swe.set_boundary' + tag] = measure(lambda: set_boundary(sol), calls=steps, cells=cells)
+        results['swe.sGrid' + tag] = measure(lambda: sGrid(ud), cells=cells)
+
+        for layout in ('step', 'series'):
+            out = io.writer(folder=tmp, filename='bench_%s.h5' % layout, layout=layout)
+            counter = iter(range(10**9))
+            results['swe.writer.write.%s%s' % (layout, tag)] = measure(lambda: out.write(next(counter), 'h', sol.h), calls=10, cells=cells)
+
+        args = io.get_args(['-ic', 'bin'])[2]
+        ud_run = user_data(Nx, Ny, steps)
+        results['swe.main' + tag] = measure(lambda: main.run(copy.copy(ud_run), baroclinic_instability.sol_init, args, folder=tmp, filename='bench_main.h5'), repeat=1, steps=steps + 1, cells=cells)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=json.loads, default=[[64, 16], [254, 50], [1016, 200]])
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # main.run prints the progress
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, 'w')
+        results = run_cases(args.sizes, args.steps, tmp)
+        sys.stdout = stdout
+
+    print(json.dumps(results))
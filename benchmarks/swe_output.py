@@ -0,0 +1,111 @@
+"""
+Write throughput against file size of the output codecs of the shallow water solver in `w12/swe`. The snapshots of `h`, `u` and `v` of a run are written with every codec, and the time to write them and the size of the file are compared:
+
+    python benchmarks/swe_output.py [-ic bin] [-n SNAPSHOTS] [--layout series] [--buffered] [--chunks '[25, 127]']
+
+Reported are the throughput of the uncompressed data, the compression ratio and the maximum error of the stored values, which is only non-zero for the lossy scale-offset filter. The raw snapshots of the memory-mapped backend are included as `memmap`.
+
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w12', 'swe'))
+
+from data import io, raw
+from data.grid import sGrid, tGrid
+from numerics.lax_wendroff import LaxWendroff
+
+# name: keyword arguments of the writer
+codecs = {
+    'none' : dict(compression=None),
+    'lzf' : dict(compression='lzf'),
+    'lzf+shuffle' : dict(compression='lzf', shuffle=True),
+    'gzip1' : dict(compression='gzip', level=1),
+    'gzip1+shuffle' : dict(compression='gzip', level=1, shuffle=True),
+    'gzip4' : dict(compression='gzip', level=4),
+    'gzip4+shuffle' : dict(compression='gzip', level=4, shuffle=True),
+    'gzip9' : dict(compression='gzip', level=9),
+    'gzip1+scaleoffset(1e-3)' : dict(compression='gzip', level=1, max_error=1e-3),
+    'gzip1+scaleoffset(1e-6)' : dict(compression='gzip', level=1, max_error=1e-6),
+    'memmap' : None,
+}
+
+
+def get_snapshots(case, count, every):
+    # snapshots of a run, so the data compresses like the outputs of the solver
+    ud = case.UserData()
+    sg = sGrid(ud)
+    tg = tGrid(ud)
+    np.random.seed(0)
+    sol = case.sol_init(sg, ud)
+    stepper = LaxWendroff(sg)
+    snapshots = []
+    for nn in range(count):
+        snapshots.append({name : np.array(getattr(sol, name)) for name in ('h', 'u', 'v')})
+        for _ in range(every):
+            stepper(sol, tg, sg, ud)
+    return sg, snapshots
+
+
+def get_writer(folder, snapshots, layout, buffered, chunks, kwargs):
+    if kwargs is None:
+        return raw.writer(folder=folder, filename='bench_output.raw', outputs=io.get_outputs(1, 1), steps=len(snapshots))
+    return io.writer(folder=folder, filename='bench_output.h5', buffered=buffered, layout=layout, chunks=chunks, **kwargs)
+
+
+def write(folder, snapshots, layout, buffered, chunks, kwargs):
+    tic = time.perf_counter()
+    with get_writer(folder, snapshots, layout, buffered, chunks, kwargs) as out:
+        for nn, snapshot in enumerate(snapshots):
+            for name, data in snapshot.items():
+                out.write(nn, name, data)
+    return time.perf_counter() - tic
+
+
+def max_error(path, snapshots):
+    error = 0.0
+    module = raw if path.endswith('.raw') else io
+    with module.reader(os.path.dirname(path), os.path.basename(path)) as out:
+        for nn, snapshot in enumerate(snapshots):
+            for name, data in snapshot.items():
+                error = max(error, float(np.max(np.abs(out.read(name, nn) - data))))
+    return error
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write throughput and file size of the output codecs of the shallow water solver')
+    parser.add_argument('-ic', '--initial_conditions', action='store', dest='ic', default='bin', choices={'bin', 'gw'})
+    parser.add_argument('-n', '--snapshots', type=int, default=32, help='Number of snapshots')
+    parser.add_argument('--every', type=int, default=60, help='Number of time-steps between the snapshots')
+    parser.add_argument('--layout', default='series', choices={'step', 'series'})
+    parser.add_argument('--buffered', action='store_true')
+    parser.add_argument('--chunks', type=json.loads, default=None, help='Chunk shape of the spatial axes')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    if args.ic == 'bin':
+        from input import baroclinic_instability as case
+    else:
+        from input import gw as case
+
+    sg, snapshots = get_snapshots(case, args.snapshots, args.every)
+    nbytes = sum(data.nbytes for snapshot in snapshots for data in snapshot.values())
+
+    print("case %s, %i x %i, %i snapshots of h, u, v, %.2f MiB, layout %s%s" % (args.ic, sg.Nx, sg.Ny, len(snapshots), nbytes / 2**20, args.layout, ', buffered' if args.buffered else ''))
+    print("%-26s %12s %12s %10s %12s" % ('codec', 'MiB/s', 'file [MiB]', 'ratio', 'max error'))
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, kwargs in codecs.items():
+            path = os.path.join(tmp, 'bench_output.h5' if kwargs is not None else 'bench_output.raw')
+            best = float('inf')
+            for rr in range(args.repeat):
+                for old in (path, path + '.json'):
+                    if os.path.exists(old):
+                        os.remove(old)
+                best = min(best, write(tmp, snapshots, args.layout, args.buffered, args.chunks, kwargs))
+            size = os.path.getsize(path)
+            print("%-26s %12.1f %12.3f %10.2f %12.3e" % (name, nbytes / best / 2**20, size / 2**20, nbytes / size, max_error(path, snapshots)))
@@ -0,0 +1,73 @@
+"""
+Validation report of the single precision mode of the shallow water solver in `w12/swe`. Runs a case in float64 and float32 and compares the float32 solution against the float64 baseline during the run:
+
+    python benchmarks/swe_precision.py [-ic gw] [-n STEPS] [--every EVERY]
+
+Reported are the maximum error and the relative L2 error of `h`, `u` and `v`, the relative drift of the total mass, which is summed in double precision, and the time per step.
+
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w12', 'swe'))
+
+from data.grid import sGrid, tGrid
+from numerics.lax_wendroff import LaxWendroff
+
+
+def l2(a, b):
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    return np.sqrt(np.sum((a - b)**2) / max(np.sum(b**2), np.finfo(np.float64).tiny))
+
+
+def mass(sol):
+    return np.sum(sol.h[..., 1:-1, 1:-1], dtype=np.float64)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Validation of the float32 mode of the shallow water solver')
+    parser.add_argument('-ic', '--initial_conditions', action='store', dest='ic', default='gw', choices={'bin', 'gw'})
+    parser.add_argument('-n', '--steps', type=int, default=1440, help='Number of time-steps')
+    parser.add_argument('--every', type=int, default=240, help='Number of time-steps between the comparisons')
+    args = parser.parse_args()
+
+    if args.ic == 'bin':
+        from input import baroclinic_instability as case
+    else:
+        from input import gw as case
+
+    runs = {}
+    for precision in ('float64', 'float32'):
+        ud = case.UserData()
+        ud.precision = precision
+        sg = sGrid(ud)
+        tg = tGrid(ud)
+        np.random.seed(0)
+        sol = case.sol_init(sg, ud)
+        runs[precision] = {'sol' : sol, 'stepper' : LaxWendroff(sg), 'sg' : sg, 'ud' : ud, 'mass' : mass(sol), 'time' : 0.0}
+
+    print("case %s, %i x %i, dt = %.1f s" % (args.ic, sg.Nx, sg.Ny, tg.dt))
+    print("%8s %10s %12s %12s %12s %12s %12s %12s %14s %14s" % ('step', 'time [h]', 'max|dh|', 'L2(h)', 'max|du|', 'L2(u)', 'max|dv|', 'L2(v)', 'mass drift 64', 'mass drift 32'))
+    for nn in range(args.steps + 1):
+        if nn % args.every == 0 or nn == args.steps:
+            ref, sol = runs['float64']['sol'], runs['float32']['sol']
+            errors = []
+            for key in ('h', 'u', 'v'):
+                a, b = getattr(sol, key), getattr(ref, key)
+                errors += [np.max(np.abs(a.astype(np.float64) - b)), l2(a, b)]
+            drifts = [abs(mass(run['sol']) - run['mass']) / abs(run['mass']) for run in (runs['float64'], runs['float32'])]
+            print("%8i %10.2f %12.3e %12.3e %12.3e %12.3e %12.3e %12.3e %14.3e %14.3e" % ((nn, nn * tg.dt / 3600.0) + tuple(errors) + tuple(drifts)))
+
+        if nn < args.steps:
+            for run in runs.values():
+                tic = time.perf_counter()
+                run['stepper'](run['sol'], tg, run['sg'], run['ud'])
+                run['time'] += time.perf_counter() - tic
+
+    print()
+    print("%-8s %12s %14s" % ('', 'ms/step', 'state [MiB]'))
+    for precision, run in runs.items():
+        print("%-8s %12.3f %14.3f" % (precision, run['time'] / max(args.steps, 1) * 1e3, run['sol'].q.nbytes / 2**20))
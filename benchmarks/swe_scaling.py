@@ -0,0 +1,75 @@
+"""
+Strong scaling of the strip-parallel shallow water stepper in `w12/swe` on the `bin` case:
+
+    python benchmarks/swe_scaling.py [-Nx NX] [-Ny NY] [-n STEPS] [--max-workers N]
+
+The grid size is fixed and the number of worker threads goes from 1 to N. Rows with more workers than available cores only show the overhead of the threads, not the scaling, and are marked with `*`. The scaling numbers have to be measured on a machine with at least N cores.
+
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'w12', 'swe'))
+
+from data.grid import sGrid, tGrid
+from numerics.lax_wendroff import LaxWendroff
+from numerics.parallel import ParallelLaxWendroff
+from input.baroclinic_instability import UserData, sol_init
+
+
+def get_cores():
+    # the cores this process may run on, which can be fewer than the cores of the machine
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count()
+
+
+def time_stepper(stepper, sol, tg, sg, ud, steps, repeat=3):
+    # the best of `repeat` runs, after a warm-up step
+    stepper(sol, tg, sg, ud)
+    best = float('inf')
+    for _ in range(repeat):
+        tic = time.perf_counter()
+        for nn in range(steps):
+            stepper(sol, tg, sg, ud)
+        best = min(best, time.perf_counter() - tic)
+    return best / steps
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Strong scaling of the strip-parallel shallow water stepper')
+    parser.add_argument('-Nx', type=int, default=2032, help='Number of grid points in the x-direction')
+    parser.add_argument('-Ny', type=int, default=400, help='Number of grid points in the y-direction')
+    parser.add_argument('-n', '--steps', type=int, default=20, help='Number of time-steps per run')
+    parser.add_argument('--max-workers', type=int, default=get_cores(), help='Largest number of worker threads (default: the available cores)')
+    args = parser.parse_args()
+
+    ud = UserData()
+    ud.Nx, ud.Ny = args.Nx, args.Ny
+    # keep the CFL number of the default resolution
+    ud.dt = ud.dt * 254.0 / ud.Nx
+    sg = sGrid(ud)
+    tg = tGrid(ud)
+    np.random.seed(0)
+    sol0 = sol_init(sg, ud)
+
+    sol_ref = copy.deepcopy(sol0)
+    t_serial = time_stepper(LaxWendroff(sg), sol_ref, tg, sg, ud, args.steps)
+    cores = get_cores()
+    print("grid %i x %i, %i steps, %i cores, serial: %.3f ms/step" % (ud.Nx, ud.Ny, args.steps, cores, t_serial * 1e3))
+
+    print("%8s %12s %10s %12s %10s" % ('workers', 'ms/step', 'speedup', 'efficiency', 'identical'))
+    for workers in range(1, args.max_workers + 1):
+        sol = copy.deepcopy(sol0)
+        stepper = ParallelLaxWendroff(sg, workers)
+        t_step = time_stepper(stepper, sol, tg, sg, ud, args.steps)
+        stepper.close()
+        identical = all(np.array_equal(getattr(sol, key), getattr(sol_ref, key)) for key in ('h', 'u', 'v'))
+        print("%7i%s %12.3f %10.2f %12.2f %10s" % (workers, '*' if workers > cores else ' ', t_step * 1e3, t_serial / t_step, t_serial / t_step / workers, identical))
+
+    if args.max_workers > cores:
+        print("* more workers than the %i available cores, not a measure of the scaling" % cores)
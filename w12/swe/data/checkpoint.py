@@ -0,0 +1,79 @@
+import os
+import numpy as np
+from data import lazy
+from data.vars import Variables
+from input.user_data import UserDataInit
+
+# only imported if a checkpoint is written or read, see `lazy.load`
+h5py = lazy.load('h5py')
+
+
+def get_path(writer):
+    # the checkpoint is stored next to the output file
+    return writer.FILE_PATH + '.chk'
+
+
+def save(path, sol, ud, nn, t, dt, reference=None):
+    """
+    Writes a checkpoint of the solution `sol`, the user data `ud`, the time-step `nn` at time `t` and the state of the random number generator. `reference` are the values the drift of the diagnostics is measured against, if any. The checkpoint is written to a temporary file first and then renamed, so an existing checkpoint is only replaced by a complete one.
+
+    """
+    tmp_path = path + '.tmp'
+    with h5py.File(tmp_path, 'w') as file:
+        file.create_dataset('sol/q', data=sol.q)
+        file.create_dataset('sol/F', data=sol.F)
+
+        grp = file.create_group('ud')
+        for key, value in vars(ud).items():
+            grp.attrs.create(key, value)
+
+        name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+        grp = file.create_group('rng')
+        grp.create_dataset('keys', data=keys)
+        grp.attrs.create('name', name)
+        grp.attrs.create('pos', pos)
+        grp.attrs.create('has_gauss', has_gauss)
+        grp.attrs.create('cached_gaussian', cached_gaussian)
+
+        if reference is not None:
+            for key, value in reference.items():
+                file.create_dataset('reference/' + key, data=value)
+
+        file.attrs.create('nn', nn)
+        file.attrs.create('t', t)
+        file.attrs.create('dt', dt)
+
+    # make sure the checkpoint is on disk before it replaces the old one
+    fd = os.open(tmp_path, os.O_RDONLY)
+    os.fsync(fd)
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def load(path):
+    """
+    Reads the checkpoint written by `save` and restores the state of the random number generator.
+
+    Returns
+    -------
+    sol: Variables
+    ud: UserDataInit
+    chk: UserDataInit, with the attributes `nn`, `t`, `dt` and `reference`
+
+    """
+    with h5py.File(path, 'r') as file:
+        sol = Variables.__new__(Variables)
+        sol.setup(file['sol/q'][()], file['sol/F'][()])
+
+        # NumPy scalars are converted back, as they would promote single precision arrays
+        ud = UserDataInit(**{key: value.item() if isinstance(value, np.generic) else value for key, value in file['ud'].attrs.items()})
+
+        grp = file['rng']
+        name = grp.attrs['name']
+        name = name.decode() if isinstance(name, bytes) else str(name)
+        np.random.set_state((name, grp['keys'][()], int(grp.attrs['pos']), int(grp.attrs['has_gauss']), float(grp.attrs['cached_gaussian'])))
+
+        chk = UserDataInit(nn=int(file.attrs['nn']), t=float(file.attrs['t']), dt=float(file.attrs['dt']))
+        chk.reference = {key : dset[()] for key, dset in file['reference'].items()} if 'reference' in file else None
+
+    return sol, ud, chk
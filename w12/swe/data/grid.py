@@ -1,27 +1,76 @@
 import numpy as np
 
 class sGrid(object):
+    """
+    Spatial grid. The coordinates are stored as the 1D arrays `x` and `y`. `xs` and `ys` are sparse views that broadcast against each other, and `xg` and `yg` are read-only views of the full mesh of shape `(Ny, Nx)`, which take no memory. Fields derived from the grid that the initial conditions need are cached.
+
+    The floating point type of the solution is set by `ud.precision`, 'float64' if it is not given. The coordinates are kept in double precision, and the grid spacings are Python floats, so they do not promote single precision arrays.
+
+    Attributes
+    ----------
+    ud: UserData
+
+    """
+
     def __init__(self, ud):
         self.Nx = ud.Nx
         self.xmin = ud.xmin
         self.xmax = ud.xmax
 
-        self.x = np.linspace(self.xmin, self.xmax, self.Nx).reshape(-1,1)
-        self.dx = np.diff(self.x.flatten())[0]
+        self.precision = getattr(ud, 'precision', 'float64')
+
+        self.x = np.linspace(self.xmin, self.xmax, self.Nx)
+        self.dx = float(self.x[1] - self.x[0])
 
         if ud.Ny > 1:
             self.Ny = ud.Ny
             self.ymin = ud.ymin
             self.ymax = ud.ymax
 
-            self.y = np.linspace(self.ymin, self.ymax, self.Ny).reshape(1,-1)
-            self.dy = np.diff(self.y.flatten())[0]
+            self.y = np.linspace(self.ymin, self.ymax, self.Ny)
+            self.dy = float(self.y[1] - self.y[0])
         else:
-            self.y = 0.0
+            # a single row at y = 0
+            self.Ny = 1
+            self.y = np.zeros(1)
             self.dy = np.nan
 
         self.dxy = (self.dx, self.dy)
-        self.xg, self.yg = np.meshgrid(self.x, self.y)
+        self.shape = (self.Ny, self.Nx)
+
+        self.xmean = np.mean(self.x)
+        self.ymean = np.mean(self.y)
+        self._coriolis = {}
+
+    @property
+    def dtype(self):
+        return np.dtype(self.precision)
+
+    @property
+    def xs(self):
+        return self.x[np.newaxis, :]
+
+    @property
+    def ys(self):
+        return self.y[:, np.newaxis]
+
+    @property
+    def xg(self):
+        return np.broadcast_to(self.xs, self.shape)
+
+    @property
+    def yg(self):
+        return np.broadcast_to(self.ys, self.shape)
+
+    def coriolis(self, f, beta=0.0):
+        """
+        Returns the Coriolis parameter `F = f + beta * (y - ymean)` on the grid, as a read-only view of shape `(Ny, Nx)` in the precision of the solution.
+
+        """
+        if (f, beta) not in self._coriolis:
+            F = (f + beta * (self.ys - self.ymean)).astype(self.dtype)
+            self._coriolis[(f, beta)] = np.broadcast_to(F, self.shape)
+        return self._coriolis[(f, beta)]
 
 
 class tGrid(object):
@@ -29,7 +78,3 @@ class tGrid(object):
         self.T = ud.T
         self.dt = ud.dt
         self.t = np.arange(0.0, self.T+self.dt, self.dt)
-
-
-
-
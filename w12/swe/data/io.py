@@ -1,10 +1,51 @@
 import argparse
+import atexit
+import functools
+import itertools
+import json
 import os
-import h5py
+import queue
+import threading
+import time
+import warnings
+import zlib
 import numpy as np
+from data import lazy, superblock
+from data.grid import sGrid, tGrid
+from input import registry
+from input.user_data import UserDataInit
+
+# only imported if a file is written or read, see `lazy.load`
+h5py = lazy.load('h5py')
 
 class writer(object):
-    def __init__(self, folder='./output/', filename='output.h5'):
+    """
+    HDF5 output writer. With `buffered=True`, the file is kept open for the whole run and the snapshots are compressed and written by a background thread. At most `maxsize` snapshots are queued; if the queue is full, `write` blocks.
+
+    With `layout='step'`, every snapshot is stored in its own group `str(time)/name`. With `layout='series'`, every variable is stored in one extendable dataset `name` of shape `(nt, ...)`. The output times of the variable are stored in the dataset `times/name` and the output times of all variables in the dataset `time`, so the variables can be written at different output times. The buffered writer stores 8 frames per chunk, so the time-series of a point is read with few chunks, while every frame of the unbuffered writer is a chunk of its own, so an output does not rewrite the frames before it.
+
+    The variables are compressed with `compression` at the gzip `level`, optionally after the `shuffle` filter, which groups the bytes of the values by their significance. If `max_error` is set, floating point variables are quantised by the lossy scale-offset filter, such that the stored values differ by at most `max_error` from the solution. `chunks` is the chunk shape of the trailing, i.e. spatial, axes; by default the writer chooses it.
+
+    With `swmr=True`, the file is written in the single-writer/multiple-reader (SWMR) mode of HDF5, so the outputs can be read by `tail` while the run is in progress. The file is kept open for the whole run, `sync` publishes the outputs written so far, and `swmr/complete` is set to 1 when the writer is closed. SWMR needs the series layout, and no objects can be created once the file is in SWMR mode: the datasets of all variables and tables have to exist at the first `sync`, see `create_table`, and attributes written after it are only added when the writer is closed.
+
+    Attributes
+    ----------
+    folder: str
+    filename: str
+    buffered: bool
+    maxsize: int
+    layout: str, 'step' or 'series'
+    append: bool, append to an existing file instead of renaming it, e.g. for a restart
+    compression: str, 'gzip', 'lzf' or None
+    level: int, gzip compression level
+    shuffle: bool
+    max_error: float, optional. Absolute error bound of the scale-offset filter
+    chunks: tuple, optional
+    swmr: bool
+
+    """
+
+    def __init__(self, folder='./output/', filename='output.h5', buffered=False, maxsize=8, layout='step', append=False, compression='gzip', level=4, shuffle=False, max_error=None, chunks=None, swmr=False):
         self.OUTPUT_FOLDER = folder
         self.OUTPUT_FILENAME = filename
         self.FILE_PATH = self.OUTPUT_FOLDER + '/' + self.OUTPUT_FILENAME
@@ -14,55 +55,767 @@ class writer(object):
             os.mkdir(self.OUTPUT_FOLDER)
 
         # If file exists, rename it with old.
-        if os.path.exists(self.FILE_PATH):
+        if os.path.exists(self.FILE_PATH) and not append:
             os.rename(self.FILE_PATH, self.FILE_PATH+'_old')
 
-        file = h5py.File(self.FILE_PATH, 'a')
-        file.close()
+        # SWMR needs the latest file format
+        libver = 'latest' if swmr else None
+        if os.path.exists(self.FILE_PATH):
+            # a run that was killed, e.g. in SWMR mode, leaves the file marked as open by a writer
+            superblock.clear_status_flags(self.FILE_PATH)
+        else:
+            # freed file space is not reused, so the data a checkpoint refers to is not overwritten by later outputs
+            file = h5py.File(self.FILE_PATH, 'w', libver=libver, fs_strategy='none')
+            file.close()
+
+        assert layout in ('step', 'series'), "unknown output layout %s" %layout
+        assert layout == 'series' or not swmr, "the SWMR mode needs the series layout"
+        assert compression in ('gzip', 'lzf', None), "unknown compression %s" %compression
+        self.layout = layout
+        self.compression = compression
+        self.level = level
+        self.shuffle = shuffle
+        self.max_error = max_error
+        self.chunks = None if chunks is None else tuple(chunks)
+
+        self.buffered = buffered
+        self.swmr = swmr
+        self.error = None
+        self.blocks = {}
+        self.file = None
+        # attributes written in SWMR mode
+        self.deferred = {}
+        if self.buffered or self.swmr:
+            # the chunk cache has to hold the partially filled time-series chunks
+            self.file = h5py.File(self.FILE_PATH, 'r+', libver=libver, rdcc_nbytes=64*2**20, rdcc_nslots=10007)
+            if self.swmr:
+                # the marker is reset for a restart
+                if 'swmr/complete' not in self.file:
+                    self.file.create_dataset('swmr/complete', shape=(1,), dtype='i1')
+                self.file['swmr/complete'][0] = 0
+            if self.buffered:
+                self.queue = queue.Queue(maxsize=maxsize)
+                self.thread = threading.Thread(target=self.worker, daemon=True)
+                self.thread.start()
+            # make sure the file is closed properly if the user forgets to
+            atexit.register(self.close)
 
     def f(self):
+        if self.swmr:
+            return self.file
         file = h5py.File(self.FILE_PATH, 'r+')
         return file
 
-    def write(self, time, name, data):
+    def release(self, file):
+        # the file of the SWMR mode stays open for the whole run
+        if not self.swmr:
+            file.close()
+
+    def write(self, time, name, data, stride=1):
+        """
+        Writes the variable `name` at the output `time`. With `stride > 1`, only every `stride`-th point of the spatial axes, starting with the ghost cells, is stored, and the stride is stored in the attribute `stride` of the dataset.
+
+        """
         time = np.around(time, 4)
-        file = self.f()
-        file.create_dataset(str(time) + '/' + str(name), data=data, chunks=True, compression='gzip', compression_opts=4)
-        file.close()
+        if stride > 1:
+            data = data[..., ::stride, ::stride]
+        if self.buffered:
+            # the solver updates the arrays in-place, so we hand over a copy
+            data = np.array(data, copy=True)
+            if self.layout == 'series':
+                self.put(self.append_block, time, str(name), data, stride)
+            else:
+                self.put(self.write_chunks, str(time) + '/' + str(name), data, stride)
+        else:
+            data = np.asarray(data)
+            file = self.f()
+            if self.layout == 'series':
+                self.append_frame(file, time, str(name), data, stride)
+            else:
+                chunks = True if self.chunks is None else self.get_chunks(data.shape)
+                dset = file.create_dataset(str(time) + '/' + str(name), data=data, chunks=chunks, **self.filters(data.dtype))
+                self.set_stride(dset, stride)
+            self.release(file)
 
     def write_attr(self,obj):
-        file = self.f()
-        for key, value in vars(obj).items():
+        # private attributes, e.g. caches, are not written
+        attrs = {key : value for key, value in vars(obj).items() if not key.startswith('_')}
+        if self.buffered:
+            self.put(self.store_attrs, attrs)
+        else:
+            file = self.f()
+            self.store_attrs(file, attrs)
+            self.release(file)
+
+    def store_attrs(self, file, attrs):
+        # attributes cannot be created in SWMR mode, they are kept until the writer is closed
+        if file.swmr_mode:
+            self.deferred.update(attrs)
+        else:
+            self.set_attrs(file, attrs)
+
+    def write_table(self, name, columns):
+        """
+        Appends the rows `columns`, a dict of arrays with a leading row axis, to the table `name`, e.g. the time series of the diagnostics. Every column is stored in an extendable dataset `name/column`.
+
+        """
+        if self.buffered:
+            self.put(self.append_rows, str(name), columns)
+        else:
+            file = self.f()
+            self.append_rows(file, str(name), columns)
+            self.release(file)
+
+    def create_table(self, name, columns):
+        """
+        Creates the table `name` with the columns of `columns`, like `write_table` but without rows, e.g. before the first `sync` in SWMR mode. Existing columns are kept.
+
+        """
+        if self.buffered:
+            self.put(self.create_columns, str(name), columns)
+        else:
+            file = self.f()
+            self.create_columns(file, str(name), columns)
+            self.release(file)
+
+    @staticmethod
+    def create_columns(file, name, columns):
+        for key, value in columns.items():
+            value = np.asarray(value)
+            path = name + '/' + key
+            if path not in file:
+                file.create_dataset(path, shape=(0,) + value.shape[1:], maxshape=(None,) + value.shape[1:], dtype=value.dtype, chunks=True)
+
+    @classmethod
+    def append_rows(cls, file, name, columns):
+        for key, value in columns.items():
+            value = np.asarray(value)
+            if value.shape[0] == 0:
+                continue
+            path = name + '/' + key
+            cls.create_columns(file, name, {key : value})
+            dset = file[path]
+            nn = dset.shape[0]
+            dset.resize(nn + value.shape[0], axis=0)
+            dset[nn:] = value
+
+    def truncate_table(self, name, column, value):
+        """
+        Removes the rows of the table `name` at and after the first row at which `column` reaches `value`.
+
+        """
+        if self.buffered:
+            self.put(self.remove_rows, str(name), column, value)
+        else:
+            file = self.f()
+            self.remove_rows(file, str(name), column, value)
+            self.release(file)
+
+    @staticmethod
+    def remove_rows(file, name, column, value):
+        if name not in file:
+            return
+        grp = file[name]
+        nn = int(np.searchsorted(grp[column][:], value))
+        for dset in grp.values():
+            dset.resize(min(nn, dset.shape[0]), axis=0)
+
+    def truncate(self, time):
+        """
+        Removes all outputs at and after `time`, e.g. those written after the checkpoint a run is restarted from.
+
+        """
+        time = np.around(time, 4)
+        if self.buffered:
+            self.put(self.remove_after, time)
+        else:
+            file = self.f()
+            self.remove_after(file, time)
+            self.release(file)
+
+    @staticmethod
+    def remove_after(file, time):
+        if 'time' in file and isinstance(file['time'], h5py.Dataset):
+            for name, dset in file.items():
+                if isinstance(dset, h5py.Dataset) and dset.shape[:1] != () and dset.maxshape[0] is None:
+                    # every variable has its own output times, except in files written before they were stored
+                    times = file['times/' + name] if 'times/' + name in file else file['time']
+                    nt = int(np.searchsorted(times[:], time))
+                    dset.resize(min(nt, dset.shape[0]), axis=0)
+                    if times.name != dset.name:
+                        times.resize(min(nt, times.shape[0]), axis=0)
+        for key in list(file.keys()):
+            try:
+                step = float(key)
+            except ValueError:
+                continue
+            if step >= time:
+                del file[key]
+
+    @staticmethod
+    def set_attrs(file, attrs):
+        for key, value in attrs.items():
             try:
                 file.attrs.create(key,value)
             except:
                 file.attrs.create(key,repr(value),dtype='<S' + str(len(repr(value))))
-        file.close()
 
+    @staticmethod
+    def set_stride(dset, stride):
+        if stride > 1:
+            dset.attrs['stride'] = stride
+
+    def filters(self, dtype, rewrites=1):
+        # keyword arguments of `create_dataset` for the filters of a variable of type `dtype`, whose chunks are quantised up to `rewrites` times
+        filters = {'compression' : self.compression, 'shuffle' : self.shuffle}
+        if self.compression == 'gzip':
+            filters['compression_opts'] = self.level
+        if self.max_error is not None and np.issubdtype(dtype, np.floating):
+            # every quantisation rounds the values to `digits` decimal places, i.e. by at most 0.5 10^-digits
+            filters['scaleoffset'] = max(0, int(np.ceil(np.log10(0.5 * rewrites / self.max_error))))
+        return filters
 
+    def get_chunks(self, shape):
+        # the chunk shape of the trailing axes is given, leading axes, e.g. the members of an ensemble, are chunked one at a time
+        nd = min(len(self.chunks), len(shape))
+        chunks = tuple(max(1, min(chunk, size)) for chunk, size in zip(self.chunks[len(self.chunks)-nd:], shape[len(shape)-nd:]))
+        return (1,) * (len(shape) - nd) + chunks
 
-def get_args():
+    @staticmethod
+    def direct(dset):
+        # the gzip level and the shuffle flag of `dset`, if its chunks can be compressed outside of HDF5, otherwise None
+        if dset.scaleoffset is not None or dset.fletcher32 or dset.compression not in ('gzip', None):
+            return None
+        return dset.compression_opts, dset.shuffle
+
+    @staticmethod
+    def encode(chunk, level, shuffle):
+        chunk = np.ascontiguousarray(chunk)
+        if shuffle:
+            # the shuffle filter stores the first bytes of all values, then the second bytes, and so on
+            chunk = np.ascontiguousarray(chunk.view(np.uint8).reshape(-1, chunk.itemsize).T)
+        return chunk if level is None else zlib.compress(chunk, level)
+
+    def write_tiles(self, dset, block, origin):
+        # writes `block`, which starts at the chunk boundary `origin` of `dset`, chunk by chunk
+        codec = self.direct(dset)
+        if codec is None:
+            # e.g. lzf and scale-offset are only applied by HDF5
+            dset[tuple(slice(o, o+n) for o, n in zip(origin, block.shape))] = block
+            return
+
+        chunks = dset.chunks
+        tiles = [range(0, size, chunk) for size, chunk in zip(block.shape, chunks)]
+        for offset in itertools.product(*tiles):
+            tile = block[tuple(slice(o, o+c) for o, c in zip(offset, chunks))]
+            # HDF5 stores edge chunks at full size
+            if tile.shape != chunks:
+                tile = np.pad(tile, [(0, c - n) for n, c in zip(tile.shape, chunks)])
+            dset.id.write_direct_chunk(tuple(o + p for o, p in zip(origin, offset)), self.encode(tile, *codec))
+
+    def write_chunks(self, file, key, data, stride=1, chunk_bytes=2**20):
+        # h5py holds the GIL in the HDF5 filters, zlib does not
+        data = np.ascontiguousarray(data)
+        if data.ndim == 0:
+            file.create_dataset(key, data=data)
+            return
+
+        if self.chunks is None:
+            rows = max(1, min(data.shape[0], chunk_bytes // max(1, data[:1].nbytes)))
+            chunks = (rows,) + data.shape[1:]
+        else:
+            chunks = self.get_chunks(data.shape)
+        dset = file.create_dataset(key, shape=data.shape, dtype=data.dtype, chunks=chunks, **self.filters(data.dtype))
+        self.set_stride(dset, stride)
+        self.write_tiles(dset, data, (0,) * data.ndim)
+
+    @staticmethod
+    def series_chunks(shape, itemsize, nt=8, chunk_bytes=2**20):
+        # a chunk holds `nt` frames of a spatial tile. Whole frames are read as a few tiles and the time-series of a point is read as `nt` frames per chunk.
+        chunks = list(shape)
+        while nt * int(np.prod(chunks)) * itemsize > chunk_bytes and max(chunks) > 1:
+            dim = int(np.argmax(chunks))
+            chunks[dim] = (chunks[dim] + 1) // 2
+        return (nt,) + tuple(chunks)
+
+    def get_series(self, file, name, shape, dtype, stride=1, nt=8):
+        if 'time' not in file:
+            file.create_dataset('time', shape=(0,), maxshape=(None,), dtype='f8', chunks=(1024,))
+        if name not in file:
+            chunks = self.series_chunks(shape, np.dtype(dtype).itemsize, nt) if self.chunks is None else (nt,) + self.get_chunks(shape)
+            # a chunk is rewritten, and quantised again, for every frame until it is full
+            dset = file.create_dataset(name, shape=(0,) + shape, maxshape=(None,) + shape, dtype=dtype, chunks=chunks, **self.filters(dtype, nt))
+            self.set_stride(dset, stride)
+        if 'times/' + name not in file:
+            # files written before the times of every variable were stored have all variables at every output time
+            times = file['time'][:file[name].shape[0]]
+            file.create_dataset('times/' + name, data=times, maxshape=(None,), dtype='f8', chunks=(1024,))
+        return file[name]
+
+    @staticmethod
+    def append_time(file, time, name):
+        for path in ('time', 'times/' + name):
+            times = file[path]
+            nt = times.shape[0]
+            if nt == 0 or times[nt-1] != time:
+                times.resize(nt+1, axis=0)
+                times[nt] = time
+
+    def append_frame(self, file, time, name, data, stride=1):
+        # a chunk per frame, otherwise every output would read, decompress and rewrite the frames before it in the chunk
+        dset = self.get_series(file, name, data.shape, data.dtype, stride, nt=1)
+        self.append_time(file, time, name)
+        nn = dset.shape[0]
+        dset.resize(nn+1, axis=0)
+        dset[nn] = data
+
+    def append_block(self, file, time, name, data, stride=1):
+        # collect the frames of one chunk in time and write the chunks directly once they are full
+        dset = self.get_series(file, name, data.shape, data.dtype, stride)
+        self.append_time(file, time, name)
+
+        if name not in self.blocks:
+            # the block starts at a chunk boundary, frames already in the file, e.g. from before a restart, are read back
+            block = np.zeros(dset.chunks[:1] + data.shape, dtype=data.dtype)
+            nn = dset.shape[0]
+            t0 = nn - nn % block.shape[0]
+            block[:nn-t0] = dset[t0:nn]
+            self.blocks[name] = [block, t0, nn-t0]
+        block, t0, nb = self.blocks[name]
+        block[nb] = data
+        nb += 1
+        self.blocks[name][2] = nb
+
+        if nb == block.shape[0]:
+            dset.resize(t0+nb, axis=0)
+            self.write_tiles(dset, block, (t0,) + (0,) * data.ndim)
+            self.blocks[name] = [block, t0+nb, 0]
+
+    def flush_blocks(self, file):
+        # partially filled blocks are written through the HDF5 filters, but kept in memory until they are full
+        for name, (block, t0, nb) in self.blocks.items():
+            if nb > 0:
+                dset = file[name]
+                dset.resize(t0+nb, axis=0)
+                dset[t0:t0+nb] = block[:nb]
+
+    def put(self, func, *args):
+        if self.error is not None:
+            raise RuntimeError("background writer failed") from self.error
+        # blocks if the queue is full, i.e. back-pressure on the time loop
+        self.queue.put((func, args))
+
+    def worker(self):
+        while True:
+            item = self.queue.get()
+            try:
+                if item is None:
+                    break
+                if self.error is None:
+                    func, args = item
+                    func(self.file, *args)
+            except Exception as err:
+                self.error = err
+            finally:
+                self.queue.task_done()
+
+    def sync(self):
+        """
+        In SWMR mode, makes the outputs written so far visible to the readers of the file, see `tail`. The first call switches the file to SWMR mode. Does nothing in the other modes.
+
+        """
+        if not self.swmr:
+            return
+        if self.buffered:
+            self.put(self.publish)
+        else:
+            self.publish(self.file)
+
+    def publish(self, file):
+        # the partially filled blocks are written, so the readers see every output
+        self.flush_blocks(file)
+        if not file.swmr_mode:
+            file.swmr_mode = True
+        file.flush()
+
+    def finish(self, file):
+        self.flush_blocks(file)
+        if self.swmr:
+            file['swmr/complete'][0] = 1
+            file.flush()
+
+    def flush(self):
+        if self.buffered:
+            self.put(self.flush_blocks)
+            self.queue.join()
+            self.file.flush()
+            if self.error is not None:
+                raise RuntimeError("background writer failed") from self.error
+        elif self.swmr:
+            self.file.flush()
+
+    def close(self):
+        if self.file is None:
+            return
+        if self.buffered:
+            self.queue.put((self.finish, ()))
+            self.queue.put(None)
+            self.thread.join()
+        else:
+            self.finish(self.file)
+        self.file.close()
+        self.file = None
+        atexit.unregister(self.close)
+        if self.error is not None:
+            raise RuntimeError("background writer failed") from self.error
+        if self.deferred:
+            self.add_deferred()
+
+    def add_deferred(self, wait=10.0):
+        # the readers lock the file, usually only until they have seen that the run is complete
+        start = time.monotonic()
+        while True:
+            try:
+                file = h5py.File(self.FILE_PATH, 'r+', libver='latest')
+                break
+            except OSError:
+                if time.monotonic() - start > wait:
+                    warnings.warn("the attributes %s are not written, %s is still open by a reader" %(sorted(self.deferred), self.FILE_PATH))
+                    return
+                time.sleep(0.1)
+        with file:
+            self.set_attrs(file, self.deferred)
+        self.deferred = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.close()
+        except RuntimeError:
+            # do not mask the exception raised in the time loop
+            if exc_type is None:
+                raise
+
+
+
+class reader(object):
     """
-    Argument parser for initial conditions and userdata file.
+    Lazy HDF5 output reader for both layouts of `writer`. Snapshots are only read when they are requested, either one at a time, in windows of consecutive output times, or as hyperslabs. A hyperslab `sel` is a tuple of slices for the spatial axes, i.e. `(slice(j0,j1), slice(i0,i1))`, with an additional leading slice for the member axis of an ensemble. The reductions stream over the snapshots in a single pass, so their memory does not grow with the length of the run.
+
+    The outputs of a variable are counted over its own output times `times_of(name)`, which are a subset of `times` if the variables were written at different output times. Variables written with a spatial stride have the grid points `sg.xs[..., ::stride, ::stride]`.
+
+    Attributes
+    ----------
+    folder: str
+    filename: str
+    layout: str, 'step' or 'series'
+    times: ndarray, output times
 
     """
 
-    parser = argparse.ArgumentParser(description='Python solver for the heat equation')
+    def __init__(self, folder='./output/', filename='output.h5'):
+        self.OUTPUT_FOLDER = folder
+        self.OUTPUT_FILENAME = filename
+        self.FILE_PATH = self.OUTPUT_FOLDER + '/' + self.OUTPUT_FILENAME
+
+        self.file = self.open()
+        if 'time' in self.file and isinstance(self.file['time'], h5py.Dataset):
+            self.layout = 'series'
+            self.times = self.file['time'][:]
+            self.keys = None
+        else:
+            self.layout = 'step'
+            steps = {}
+            for key in self.file.keys():
+                try:
+                    steps[float(key)] = key
+                except ValueError:
+                    continue
+            self.times = np.array(sorted(steps))
+            self.keys = [steps[time] for time in self.times]
+        self.groups = {}
+
+    def open(self):
+        return h5py.File(self.FILE_PATH, 'r')
+
+    def times_of(self, name):
+        """
+        Returns the output times of variable `name`.
+
+        """
+        if self.layout == 'series':
+            return self.file['times/' + name][:] if 'times/' + name in self.file else self.times
+        return self.times[self.indices(name)]
+
+    def indices(self, name):
+        # the output groups of the step layout that contain variable `name`
+        if name not in self.groups:
+            self.groups[name] = [nn for nn, key in enumerate(self.keys) if name in self.file[key]]
+        return self.groups[name]
+
+    def stride(self, name):
+        """
+        Returns the spatial stride of variable `name`.
+
+        """
+        dset = self.file[name] if self.layout == 'series' else self.file[self.keys[self.indices(name)[0]]][name]
+        return int(dset.attrs.get('stride', 1))
+
+    @property
+    def attrs(self):
+        attrs = {}
+        for key, value in self.file.attrs.items():
+            # the repr fallback of `writer.set_attrs` is stored as bytes
+            attrs[key] = value.decode() if isinstance(value, bytes) else value
+        return UserDataInit(**attrs)
+
+    def grids(self):
+        """
+        Returns the `sGrid` and `tGrid` of the run, rebuilt from the attributes stored by `writer.write_attr`.
+
+        """
+        attrs = self.attrs
+        ud = UserDataInit(Nx=int(attrs.Nx), xmin=attrs.xmin, xmax=attrs.xmax, Ny=int(getattr(attrs, 'Ny', 1)), T=attrs.T, dt=attrs.dt, precision=getattr(attrs, 'precision', 'float64'))
+        if ud.Ny > 1:
+            ud.update_ud({'ymin' : attrs.ymin, 'ymax' : attrs.ymax})
+        return sGrid(ud), tGrid(ud)
+
+    def table(self, name):
+        """
+        Returns the table `name` written by `writer.write_table` as a dict of arrays.
+
+        """
+        return {key : dset[()] for key, dset in self.file[name].items()} if name in self.file else {}
+
+    def names(self):
+        if self.layout == 'series':
+            return [name for name, dset in self.file.items() if isinstance(dset, h5py.Dataset) and name != 'time']
+        return list(self.file[self.keys[0]].keys()) if len(self.keys) > 0 else []
+
+    def __len__(self):
+        return len(self.times)
+
+    def read(self, name, nn, sel=()):
+        """
+        Returns the hyperslab `sel` of variable `name` at its output `nn`.
+
+        """
+        if self.layout == 'series':
+            return self.file[name][(nn,) + tuple(sel)]
+        return self.file[self.keys[self.indices(name)[nn]]][name][tuple(sel)]
+
+    def read_window(self, name, n0, n1, sel=()):
+        """
+        Returns the hyperslab `sel` of variable `name` at its outputs `n0` to `n1` as an array of shape `(n1-n0, ...)`.
+
+        """
+        if self.layout == 'series':
+            return self.file[name][(slice(n0, n1),) + tuple(sel)]
+        keys = [self.keys[nn] for nn in self.indices(name)[n0:n1]]
+        return np.stack([self.file[key][name][tuple(sel)] for key in keys])
+
+    def snapshots(self, names=('h', 'u', 'v'), sel=(), start=0, stop=None):
+        """
+        Generator over the output times at which all variables `names` were written. Yields the time and a dict of the hyperslabs `sel` of the variables.
+
+        """
+        times = {name : self.times_of(name) for name in names}
+        common = functools.reduce(np.intersect1d, times.values())
+        stop = len(common) if stop is None else stop
+        for time in common[start:stop]:
+            yield time, {name : self.read(name, int(np.searchsorted(times[name], time)), sel) for name in names}
+
+    def windows(self, name, size, sel=(), start=0, stop=None):
+        """
+        Generator over windows of `size` consecutive outputs of variable `name`. Yields the times and the hyperslabs `sel` of the variable in the window. In the series layout, a window is read with a single hyperslab selection.
+
+        """
+        times = self.times_of(name)
+        stop = len(times) if stop is None else stop
+        for n0 in range(start, stop, size):
+            n1 = min(n0 + size, stop)
+            yield times[n0:n1], self.read_window(name, n0, n1, sel)
+
+    def time_mean(self, name, sel=(), start=0, stop=None, size=8):
+        """
+        Returns the time mean of the hyperslab `sel` of variable `name`, accumulated in double precision.
+
+        """
+        total, count = 0.0, 0
+        for _, data in self.windows(name, size, sel, start, stop):
+            total = total + data.sum(axis=0, dtype=np.float64)
+            count += data.shape[0]
+        return total / count
+
+    def zonal_mean(self, name, sel=(), start=0, stop=None, size=8):
+        """
+        Returns the zonal, i.e. x-, mean of the hyperslab `sel` of variable `name` at every output time, as an array of shape `(nt, ..., Ny)`.
+
+        """
+        means = [data.mean(axis=-1) for _, data in self.windows(name, size, sel, start, stop)]
+        return np.concatenate(means)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    parser.add_argument('-ic', '--initial_conditions', action='store', dest='ic', help='<Required> Set initial conditions', required=True, choices={'random', 'bin', 'gw'})
 
-    args = parser.parse_args() # collect cmd line args
-    ic = args.ic
 
-    if   ic == 'random':
-        # from input.random import UserData, sol_init
-        raise NotImplementedError("random IC not yet implemented")
-    elif ic == 'bin': 
-        from input.baroclinic_instability import UserData, sol_init
-    elif ic == 'gw':
-        from input.gw import UserData, sol_init
+class tail(reader):
+    """
+    Reader of an output file that is written by a run in progress, with `writer(swmr=True)`. The file can only be opened once the writer has switched it to SWMR mode at its first `sync`, so the reader waits for it for up to `timeout` seconds. `refresh` updates the reader to the outputs the writer has published so far, and `follow` yields the outputs as the run completes them, so the analysis overlaps with the run. Files written without SWMR are read as complete.
+
+    A killed or crashed run never marks the file as complete. The writer modifies the file at every output, so `follow` takes the run to have died if the file has not changed for `timeout` seconds, 10 minutes by default. The timeout has to be longer than the time between two outputs of the run. With `timeout=None`, the reader waits forever.
+
+    Attributes
+    ----------
+    folder: str
+    filename: str
+    poll: float, seconds between the checks for new outputs
+    timeout: float, optional. Seconds to wait for the file, or without a change of the file.
+
+    """
+
+    def __init__(self, folder='./output/', filename='output.h5', poll=1.0, timeout=600.0):
+        self.poll = poll
+        self.timeout = timeout
+        super().__init__(folder, filename)
+        if self.layout != 'series':
+            raise ValueError("%s is not written with the series layout" %self.FILE_PATH)
+
+    def open(self):
+        start = time.monotonic()
+        while True:
+            try:
+                return h5py.File(self.FILE_PATH, 'r', libver='latest', swmr=True)
+            except OSError:
+                # the file does not exist yet, or the writer has not switched it to SWMR mode
+                if self.timeout is not None and time.monotonic() - start > self.timeout:
+                    raise
+            time.sleep(self.poll)
+
+    @property
+    def complete(self):
+        """
+        Whether the writer is closed, i.e. all outputs are published.
+
+        """
+        if 'swmr/complete' not in self.file:
+            return True
+        marker = self.file['swmr/complete']
+        marker.refresh()
+        return bool(marker[0])
+
+    def refresh(self):
+        """
+        Updates the output times, the variables and the tables to the outputs published by the writer so far.
+
+        """
+        def visit(name, obj):
+            if isinstance(obj, h5py.Dataset):
+                obj.refresh()
+        self.file.visititems(visit)
+        self.times = self.file['time'][:]
+
+    def count(self, name):
+        # the output times are extended before the variable, so only outputs with both are counted
+        return min(len(self.times_of(name)), self.file[name].shape[0])
+
+    def follow(self, name, size=1, sel=(), start=0):
+        """
+        Generator over windows of `size` consecutive outputs of variable `name`, like `windows`, that waits for the run to publish them. Once the run is complete, the last window may be shorter and the generator stops. Raises a `TimeoutError` if the run is not complete and the file has not changed for `timeout` seconds, e.g. if the run was killed.
+
+        """
+        n0 = start
+        last = time.monotonic()
+        mtime = os.stat(self.FILE_PATH).st_mtime_ns
+        while True:
+            # checked before the refresh, so the outputs of a complete run are all seen
+            complete = self.complete
+            self.refresh()
+            times, nt = self.times_of(name), self.count(name)
+            while nt - n0 >= size or (complete and n0 < nt):
+                n1 = min(n0 + size, nt)
+                yield times[n0:n1], self.read_window(name, n0, n1, sel)
+                n0 = n1
+                last = time.monotonic()
+            if complete:
+                return
+            # the writer is alive as long as it modifies the file
+            modified = os.stat(self.FILE_PATH).st_mtime_ns
+            if modified != mtime:
+                mtime, last = modified, time.monotonic()
+            if self.timeout is not None and time.monotonic() - last > self.timeout:
+                raise TimeoutError("%s has not changed for %g s, the run has not completed" %(self.FILE_PATH, self.timeout))
+            time.sleep(self.poll)
+
+
+
+def get_outputs(every=60, stride=1, names=('h', 'u', 'v')):
+    """
+    Returns the number of time-steps between the outputs and the spatial stride of the variables `names` as a dict of `(every, stride)` tuples. `every` and `stride` are either the same for all variables or dicts by variable, in which case the variables that are left out are written every 60 time-steps at full resolution.
+
+    """
+    every = every if isinstance(every, dict) else dict.fromkeys(names, every)
+    stride = stride if isinstance(stride, dict) else dict.fromkeys(names, stride)
+    unknown = (set(every) | set(stride)) - set(names)
+    if unknown:
+        raise ValueError("unknown output variables %s" %sorted(unknown))
+
+    outputs = {name : (int(every.get(name, 60)), int(stride.get(name, 1))) for name in names}
+    if any(min(output) < 1 for output in outputs.values()):
+        raise ValueError("the output cadence and stride have to be positive, got %s" %outputs)
+    return outputs
+
+
+def get_args(argv=None):
+    """
+    Argument parser for initial conditions and userdata file. The parsed arguments are returned alongside, so that the run options can be passed on. `argv` defaults to the command line arguments.
+
+    The initial conditions are those found by `registry.get_initial_conditions`, and only the module of the chosen one is imported.
+
+    """
+
+    parser = argparse.ArgumentParser(description='Python solver for the heat equation')
+
+    parser.add_argument('-ic', '--initial_conditions', action='store', dest='ic', help='<Required> Set initial conditions', required=True, choices=sorted(registry.get_initial_conditions()))
+    parser.add_argument('--dry-run', action='store_true', dest='dry_run', help='Check the user data and the options, print the grid and the number of time-steps and outputs, and exit without running')
+    parser.add_argument('--buffered', action='store_true', dest='buffered', help='Keep the output file open and write from a background thread')
+    parser.add_argument('--backend', action='store', dest='backend', help='Set the backend of the time-stepper', default='numpy', choices={'numpy', 'numba'})
+    parser.add_argument('--workers', action='store', dest='workers', type=int, default=1, help='Set the number of threads that advance strips of the domain')
+    parser.add_argument('--adaptive', action='store_true', dest='adaptive', help='Choose the time-step from the CFL number of the solution')
+    parser.add_argument('--members', action='store', dest='members', type=int, default=1, help='Set the number of ensemble members that are advanced together')
+    parser.add_argument('--seed', action='store', dest='seed', type=int, default=None, help='Set the random seed, member m of an ensemble uses seed + m')
+    parser.add_argument('--checkpoint', action='store', dest='checkpoint', type=int, default=0, help='Write a checkpoint every CHECKPOINT time-steps (a multiple of the output interval with --adaptive)')
+    parser.add_argument('--restart', action='store_true', dest='restart', help='Continue the run from the last checkpoint')
+    parser.add_argument('--profile', action='store_true', dest='profile', help='Time the phases of the run and print a summary at the end')
+    parser.add_argument('--diagnostics', action='store_true', dest='diagnostics', help='Store the mass, energy and potential vorticity of every time-step and stop if the run becomes unstable')
+    parser.add_argument('--max-drift', action='store', dest='max_drift', type=float, default=None, help='Stop the run if the mass or energy drift by more than MAX_DRIFT relative to the start, implies --diagnostics')
+    parser.add_argument('--precision', action='store', dest='precision', help='Set the floating point precision of the solution, a restart keeps the precision of the checkpoint', default=None, choices={'float64', 'float32'})
+    parser.add_argument('--layout', action='store', dest='layout', help='Store one group per output step or one dataset per variable', default='step', choices={'step', 'series'})
+    parser.add_argument('--swmr', action='store_true', dest='swmr', help='Write the HDF5 output in SWMR mode, so it can be read with io.tail while the run is in progress, implies --layout series')
+    parser.add_argument('--format', action='store', dest='format', help='Write HDF5 outputs or raw snapshots to a preallocated memory-mapped file FILE.raw with the attributes in FILE.raw.json', default='hdf5', choices={'hdf5', 'memmap'})
+    parser.add_argument('--compression', action='store', dest='compression', help='Set the compression of the outputs', default='gzip', choices={'none', 'lzf', 'gzip'})
+    parser.add_argument('--level', action='store', dest='level', type=int, default=4, help='Set the gzip compression level of the outputs')
+    parser.add_argument('--shuffle', action='store_true', dest='shuffle', help='Apply the shuffle filter before the compression of the outputs')
+    parser.add_argument('--max-error', action='store', dest='max_error', type=float, default=None, help='Quantise the outputs with the lossy scale-offset filter to an absolute error of at most MAX_ERROR')
+    parser.add_argument('--chunks', action='store', dest='chunks', type=json.loads, default=None, help='Set the chunk shape of the spatial axes of the outputs, e.g. [25, 127]')
+    parser.add_argument('--every', action='store', dest='every', type=json.loads, default=60, help='Set the number of time-steps between the outputs, for all variables or per variable, e.g. \'{"h": 10, "u": 60, "v": 60}\'')
+    parser.add_argument('--stride', action='store', dest='stride', type=json.loads, default=1, help='Only write every STRIDE-th point of the spatial axes, for all variables or per variable')
+
+    args = parser.parse_args(argv) # collect cmd line args
+    if args.swmr and args.format == 'memmap':
+        parser.error("--swmr is only supported for the HDF5 output")
+    UserData, sol_init = registry.load(args.ic)
 
-    return UserData, sol_init
+    return UserData, sol_init, args
 
 
 
@@ -0,0 +1,21 @@
+import importlib.util
+import sys
+
+
+def load(name):
+    """
+    Returns the module `name` without importing it. The module is imported when one of its attributes is used for the first time, so heavy dependencies that a run does not need, e.g. `h5py` for `--help`, `--dry-run` or raw outputs, cost no start-up time. The lazy module is registered in `sys.modules`, so modules that import `name` afterwards get the same module. A module that is imported already is returned as it is.
+
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError("No module named %r" %name, name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,214 @@
+import json
+import math
+import os
+import numpy as np
+from data import io
+from input.user_data import UserDataInit
+
+
+class writer(object):
+    """
+    Raw output writer. The snapshots are copied into a `numpy.memmap` of shape `(length, nvar, ...)` that is preallocated for all outputs of the run, without compression and without opening the file at every output. The shape, the type and the variables of the snapshots, the attributes written by `write_attr` and the tables written by `write_table` are stored in the JSON sidecar `FILE_PATH + '.json'`, which is updated by `flush` and `close`.
+
+    Output slot `k` holds the snapshots at the time-step `k * every`, where `every` is the greatest common divisor of the output cadences. Slots at which a variable is not written are left empty. All variables have to be written with the same stride.
+
+    Attributes
+    ----------
+    folder: str
+    filename: str
+    outputs: dict of (every, stride) by variable, see `io.get_outputs`
+    steps: int, number of time-steps of the run
+    append: bool, map the existing file instead of renaming it, e.g. for a restart
+
+    """
+
+    def __init__(self, folder='./output/', filename='output.raw', outputs=None, steps=1, append=False):
+        self.OUTPUT_FOLDER = folder
+        self.OUTPUT_FILENAME = filename
+        self.FILE_PATH = self.OUTPUT_FOLDER + '/' + self.OUTPUT_FILENAME
+        self.META_PATH = self.FILE_PATH + '.json'
+
+        if not os.path.exists(self.OUTPUT_FOLDER):
+            os.mkdir(self.OUTPUT_FOLDER)
+
+        if os.path.exists(self.FILE_PATH) and not append:
+            os.rename(self.FILE_PATH, self.FILE_PATH+'_old')
+            if os.path.exists(self.META_PATH):
+                os.rename(self.META_PATH, self.META_PATH+'_old')
+
+        self.data = None
+        if os.path.exists(self.FILE_PATH) and os.path.exists(self.META_PATH):
+            with open(self.META_PATH) as file:
+                self.meta = json.load(file)
+            if self.meta['shape'] is not None:
+                self.data = np.memmap(self.FILE_PATH, mode='r+', dtype=self.meta['dtype'], shape=self.get_shape())
+        else:
+            outputs = io.get_outputs() if outputs is None else outputs
+            if len({stride for _, stride in outputs.values()}) > 1:
+                raise ValueError("the raw output needs the same stride for all variables, got %s" %outputs)
+            every = math.gcd(*(every for every, _ in outputs.values()))
+            self.meta = {
+                'names' : list(outputs),
+                'outputs' : outputs,
+                'every' : every,
+                'length' : (steps - 1) // every + 1,
+                'shape' : None,
+                'dtype' : None,
+                'count' : 0,
+                'attrs' : {},
+                'tables' : {},
+            }
+            self.save()
+
+        self.index = {name : nn for nn, name in enumerate(self.meta['names'])}
+
+    def get_shape(self):
+        meta = self.meta
+        return (meta['length'], len(meta['names'])) + tuple(meta['shape'])
+
+    def allocate(self, data):
+        # the file is sized for all outputs on the first snapshot, when the shape and the type are known
+        self.meta['shape'] = list(data.shape)
+        self.meta['dtype'] = data.dtype.str
+        self.data = np.memmap(self.FILE_PATH, mode='w+', dtype=data.dtype, shape=self.get_shape())
+        self.save()
+
+    def write(self, time, name, data, stride=1):
+        if stride > 1:
+            data = data[..., ::stride, ::stride]
+        if self.data is None:
+            self.allocate(np.asarray(data))
+        slot, rest = divmod(int(round(time)), self.meta['every'])
+        assert rest == 0 and slot < self.meta['length'], "no output slot for time-step %s" %time
+        self.data[slot, self.index[name]] = data
+        self.meta['count'] = max(self.meta['count'], slot + 1)
+
+    def write_attr(self, obj):
+        # private attributes, e.g. caches, are not written
+        self.meta['attrs'].update({key : value for key, value in vars(obj).items() if not key.startswith('_')})
+        self.save()
+
+    def write_table(self, name, columns):
+        """
+        Appends the rows `columns`, a dict of arrays with a leading row axis, to the table `name`.
+
+        """
+        table = self.meta['tables'].setdefault(str(name), {})
+        for key, value in columns.items():
+            table.setdefault(key, []).extend(np.asarray(value).tolist())
+
+    def truncate_table(self, name, column, value):
+        """
+        Removes the rows of the table `name` at and after the first row at which `column` reaches `value`.
+
+        """
+        table = self.meta['tables'].get(str(name))
+        if table is None:
+            return
+        nn = int(np.searchsorted(table[column], value))
+        for key in table:
+            del table[key][nn:]
+
+    def truncate(self, time):
+        """
+        Removes all outputs at and after `time`, e.g. those written after the checkpoint a run is restarted from.
+
+        """
+        self.meta['count'] = min(self.meta['count'], -(-int(round(time)) // self.meta['every']))
+        self.save()
+
+    @staticmethod
+    def encode(value):
+        # arrays and numpy scalars are stored as JSON values, everything else as its repr
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        if isinstance(value, np.generic):
+            return value.item()
+        return repr(value)
+
+    def save(self):
+        # written to a temporary file first, so the sidecar is never left half written
+        with open(self.META_PATH + '.tmp', 'w') as file:
+            json.dump(self.meta, file, default=self.encode)
+        os.replace(self.META_PATH + '.tmp', self.META_PATH)
+
+    def sync(self):
+        # the raw output has no live mode, the readers see the outputs once `flush` updates the sidecar
+        pass
+
+    def flush(self):
+        if self.data is not None:
+            self.data.flush()
+        self.save()
+
+    def close(self):
+        self.flush()
+        self.data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+
+class reader(io.reader):
+    """
+    Reader of the raw output of `writer`. The file is mapped read-only, so `read` and `read_window` return views of the mapped file instead of copies, and any window in time and space is only read from disk when it is used. The views are no longer valid once the reader is closed, copy them to keep them.
+
+    Attributes
+    ----------
+    folder: str
+    filename: str
+    times: ndarray, output times
+
+    """
+
+    def __init__(self, folder='./output/', filename='output.raw'):
+        self.OUTPUT_FOLDER = folder
+        self.OUTPUT_FILENAME = filename
+        self.FILE_PATH = self.OUTPUT_FOLDER + '/' + self.OUTPUT_FILENAME
+
+        with open(self.FILE_PATH + '.json') as file:
+            self.meta = json.load(file)
+        self.layout = 'raw'
+
+        meta = self.meta
+        self.data = None
+        if meta['shape'] is not None:
+            shape = (meta['length'], len(meta['names'])) + tuple(meta['shape'])
+            self.data = np.memmap(self.FILE_PATH, mode='r', dtype=meta['dtype'], shape=shape)
+        self.index = {name : nn for nn, name in enumerate(meta['names'])}
+        self.times = np.arange(meta['count'], dtype=np.float64) * meta['every']
+
+    def steps(self, name):
+        # number of output slots between the outputs of variable `name`
+        return self.meta['outputs'][name][0] // self.meta['every']
+
+    def times_of(self, name):
+        return self.times[::self.steps(name)]
+
+    def stride(self, name):
+        return int(self.meta['outputs'][name][1])
+
+    @property
+    def attrs(self):
+        attrs = {key : np.asarray(value) if isinstance(value, list) else value for key, value in self.meta['attrs'].items()}
+        return UserDataInit(**attrs)
+
+    def table(self, name):
+        return {key : np.array(values) for key, values in self.meta['tables'].get(name, {}).items()}
+
+    def names(self):
+        return list(self.meta['names'])
+
+    def read(self, name, nn, sel=()):
+        return self.data[(nn * self.steps(name), self.index[name]) + tuple(sel)]
+
+    def read_window(self, name, n0, n1, sel=()):
+        step = self.steps(name)
+        return self.data[(slice(n0 * step, n1 * step, step), self.index[name]) + tuple(sel)]
+
+    def close(self):
+        self.data = None
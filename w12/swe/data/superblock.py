@@ -0,0 +1,75 @@
+import os
+
+SIGNATURE = b'\x89HDF\r\n\x1a\n'
+MASK = 0xffffffff
+
+
+def rot(x, k):
+    return ((x << k) | (x >> (32 - k))) & MASK
+
+
+def lookup3(data, initval=0):
+    """
+    Jenkins' lookup3 hash of the bytes `data`, which HDF5 uses as the checksum of its metadata, e.g. of the superblock.
+
+    """
+    n = len(data)
+    a = b = c = (0xdeadbeef + n + initval) & MASK
+    k = 0
+    while n > 12:
+        a = (a + int.from_bytes(data[k:k+4], 'little')) & MASK
+        b = (b + int.from_bytes(data[k+4:k+8], 'little')) & MASK
+        c = (c + int.from_bytes(data[k+8:k+12], 'little')) & MASK
+        # mix
+        a = (a - c) & MASK; a ^= rot(c, 4); c = (c + b) & MASK
+        b = (b - a) & MASK; b ^= rot(a, 6); a = (a + c) & MASK
+        c = (c - b) & MASK; c ^= rot(b, 8); b = (b + a) & MASK
+        a = (a - c) & MASK; a ^= rot(c, 16); c = (c + b) & MASK
+        b = (b - a) & MASK; b ^= rot(a, 19); a = (a + c) & MASK
+        c = (c - b) & MASK; c ^= rot(b, 4); b = (b + a) & MASK
+        k += 12
+        n -= 12
+    if n == 0:
+        return c
+
+    # the last block is padded with zeros
+    last = data[k:] + bytes(12 - n)
+    a = (a + int.from_bytes(last[0:4], 'little')) & MASK
+    b = (b + int.from_bytes(last[4:8], 'little')) & MASK
+    c = (c + int.from_bytes(last[8:12], 'little')) & MASK
+    # final
+    c ^= b; c = (c - rot(b, 14)) & MASK
+    a ^= c; a = (a - rot(c, 11)) & MASK
+    b ^= a; b = (b - rot(a, 25)) & MASK
+    c ^= b; c = (c - rot(b, 16)) & MASK
+    a ^= c; a = (a - rot(c, 4)) & MASK
+    b ^= a; b = (b - rot(a, 14)) & MASK
+    c ^= b; c = (c - rot(b, 24)) & MASK
+    return c
+
+
+def clear_status_flags(path):
+    """
+    Clears the status flags of the HDF5 file `path`, like `h5clear -s --increment`. A writer sets the flags while it has the file open, and HDF5 refuses to open a file with the flags set, e.g. after a run in SWMR mode was killed. The end-of-file address is raised to the size of the file, so data that was written after the superblock was last flushed is not overwritten. Only the superblock versions 2 and 3 at the start of the file have the flags. Returns whether they were set.
+
+    The file must not be open by a running writer.
+
+    """
+    with open(path, 'r+b') as file:
+        # signature, version, sizes of the offsets and lengths, flags, four addresses and the checksum
+        head = file.read(12)
+        if head[:8] != SIGNATURE or head[8] not in (2, 3) or head[11] == 0:
+            return False
+        size = head[9]
+        block = bytearray(head + file.read(4 * size + 4))
+
+        block[11] = 0
+        eof = 12 + 2 * size
+        eoa = int.from_bytes(block[eof:eof+size], 'little')
+        block[eof:eof+size] = max(eoa, os.path.getsize(path)).to_bytes(size, 'little')
+        end = 12 + 4 * size
+        block[end:end+4] = lookup3(bytes(block[:end])).to_bytes(4, 'little')
+
+        file.seek(0)
+        file.write(block)
+    return True
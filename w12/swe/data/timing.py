@@ -0,0 +1,67 @@
+import re
+import time
+from contextlib import nullcontext
+from input.user_data import UserDataInit
+
+
+class Phase(object):
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.tic = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record = self.timer.records.setdefault(self.name, [0.0, 0])
+        record[0] += time.perf_counter() - self.tic
+        record[1] += 1
+
+
+class Timer(object):
+    """
+    Accumulates the wall time and the number of calls of the phases of a run, e.g.
+
+        with timer.phase('boundary'):
+            set_boundary(sol)
+
+    If the timer is not enabled, `phase` returns the same no-op context manager every time.
+
+    Attributes
+    ----------
+    enabled: bool
+
+    """
+
+    NULL = nullcontext()
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.records = {}
+
+    def phase(self, name):
+        if not self.enabled:
+            return self.NULL
+        return Phase(self, name)
+
+    def summary(self, total=None):
+        """
+        Returns a table of the accumulated times. The percentages are relative to `total`, or to the sum over all phases.
+
+        """
+        if total is None:
+            total = sum(seconds for seconds, calls in self.records.values())
+        lines = ["%-20s %10s %12s %14s %8s" % ('phase', 'calls', 'total [s]', 'per call [ms]', '%')]
+        for name, (seconds, calls) in sorted(self.records.items(), key=lambda item: -item[1][0]):
+            lines.append("%-20s %10i %12.4f %14.4f %8.2f" % (name, calls, seconds, 1e3 * seconds / calls, 100.0 * seconds / total))
+        lines.append("%-20s %10s %12.4f" % ('total', '', total))
+        return '\n'.join(lines)
+
+    def attrs(self):
+        # attributes for `writer.write_attr`
+        rec = {}
+        for name, (seconds, calls) in self.records.items():
+            key = re.sub(r'\W+', '_', name).strip('_')
+            rec['time_' + key] = seconds
+            rec['calls_' + key] = calls
+        return UserDataInit(**rec)
@@ -1,18 +1,97 @@
 import numpy as np
 
 class Variables(object):
-    def __init__(self, sg):
-        self.h = np.zeros_like(sg.xg)
-        self.u = np.zeros_like(sg.xg)
-        self.v = np.zeros_like(sg.xg)
-        self.squeezer()
-        
+    """
+    Solution container of the shallow water equations. The conserved variables `h`, `hu` and `hv` are the primary storage and are views of one contiguous buffer `q` of shape `(3, ..., Ny, Nx)`. The velocities `u` and `v` are computed from them when they are accessed and are read-only; use `set_primitive` to set the solution from `h`, `u` and `v`.
 
-    def flip(self):
-        for key, value in vars(self).items():
-            setattr(self, key, np.moveaxis(value,0,-1))
+    `inner` is a view of the inner domain of all variables, and `west`, `east`, `south` and `north` are views of the ghost cells, so e.g. the periodic halo of all variables is refreshed with a single copy.
 
+    Attributes
+    ----------
+    sg: sGrid
+    lead: tuple, optional. Leading axes of the arrays, e.g. the ensemble member axis.
 
-    def squeezer(self):
-        for key, value in vars(self).items():
-            setattr(self,key,value.squeeze())
\ No newline at end of file
+    """
+
+    names = ('h', 'hu', 'hv')
+
+    def __init__(self, sg, lead=()):
+        shape = tuple(lead) + sg.shape
+        dtype = sg.dtype
+        # the Coriolis parameter is the same for all members
+        self.setup(np.zeros((len(self.names),) + shape, dtype=dtype), np.zeros(shape[-2:], dtype=dtype))
+
+
+    def setup(self, q, F):
+        self.q = q
+        self.F = F
+        self.h, self.hu, self.hv = q
+
+        self.inner = q[..., 1:-1, 1:-1]
+        self.west, self.east = q[..., 0], q[..., -1]
+        self.south, self.north = q[..., 0, :], q[..., -1, :]
+
+        # buffers of the velocities, allocated on first access
+        self._u = None
+        self._v = None
+
+
+    @property
+    def u(self):
+        if self._u is None:
+            self._u = np.empty_like(self.h)
+        return self.primitive(self.hu, self._u)
+
+
+    @property
+    def v(self):
+        if self._v is None:
+            self._v = np.empty_like(self.h)
+        return self.primitive(self.hv, self._v)
+
+
+    def primitive(self, hq, out):
+        np.divide(hq, self.h, out=out)
+        # writing to the velocities would not change the solution
+        out = out.view()
+        out.flags.writeable = False
+        return out
+
+
+    def set_primitive(self, h, u, v):
+        self.h[...] = h
+        np.multiply(self.h, u, out=self.hu)
+        np.multiply(self.h, v, out=self.hv)
+
+
+    def select(self, index):
+        """
+        Returns the solution of the members `index` of an ensemble, sharing the buffers with this one.
+
+        """
+        sol = Variables.__new__(Variables)
+        F = self.F if self.F.ndim == 2 else self.F[index]
+        sol.setup(self.q[:, index], F)
+        return sol
+
+
+    def __getstate__(self):
+        # the views are rebuilt on unpickling and copying
+        return {'q' : self.q, 'F' : self.F}
+
+
+    def __setstate__(self, state):
+        self.setup(state['q'], state['F'])
+
+
+def stack(members):
+    """
+    Stacks the solutions of the ensemble `members` into one solution with a leading member axis, i.e. arrays of shape `(M, Ny, Nx)`. If the Coriolis parameter `F` is the same for all members, it is stored once.
+
+    """
+    sol = Variables.__new__(Variables)
+    F = members[0].F
+    if not all(np.array_equal(F, member.F) for member in members[1:]):
+        F = np.stack([member.F for member in members])
+    sol.setup(np.stack([member.q for member in members], axis=1), np.copy(F))
+    return sol
@@ -1,6 +1,9 @@
 import numpy as np
 from data.vars import Variables
 
+# the name of the initial conditions on the command line, see `input.registry`
+ALIASES = ('bin',)
+
 class UserData(object):
     def __init__(self):
 
@@ -15,20 +18,25 @@ class UserData(object):
         self.dt = 60.0                  # [s]
         self.T = 4.0 * 24.0 * 3600.0    # [s]    
 
+        # adaptive time-stepping
+        self.cfl = 0.5
+        self.dt_min = 1.0               # [s]
+        self.dt_max = 600.0             # [s]
+
         self.g = 9.81                   # [m/s^2]
         self.f = 1e-4                    # [s^(-1)]
         self.beta = 1.6e-11
 
     
-def sol_init(sg,ud):
+def sol_init(sg,ud,rng=np.random):
     # zonal jet
-    height = 10000. - np.tanh(20.0*((sg.yg-np.mean(sg.y))/np.max(sg.y)))*400.
+    height = 10000. - np.tanh(20.0*((sg.ys-sg.ymean)/np.max(sg.y)))*400.
 
-    F = ud.f+ud.beta*(sg.yg-np.mean(sg.y))
+    F = sg.coriolis(ud.f, ud.beta)
 
     # add random noise to the height field
-    r,c=np.shape(height)
-    height = height + 1.0*np.random.randn(r,c)*(sg.dx/1.0e5)*(np.abs(F)/1e-4)
+    r,c=sg.shape
+    height = height + 1.0*rng.randn(r,c)*(sg.dx/1.0e5)*(np.abs(F)/1e-4)
 
     height = height.T
     F = F.T
@@ -54,9 +62,7 @@ def sol_init(sg,ud):
 
     # this creates the solution container
     sol = Variables(sg)
-    sol.h[...] = height.T
-    sol.u[...] = u.T
-    sol.v[...] = v.T
+    sol.set_primitive(height.T, u.T, v.T)
     sol.F = F.T
 
     return sol
\ No newline at end of file
@@ -18,5 +18,7 @@ class UserData(object):
     
 def sol_init(sg):
     sol = Variables(sg)
-    sol.u[20:60] = 1.0
+    u = np.zeros_like(sol.h)
+    u[20:60] = 1.0
+    sol.set_primitive(sol.h, u, 0.0)
     return sol
\ No newline at end of file
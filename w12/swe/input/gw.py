@@ -15,17 +15,23 @@ class UserData(object):
         self.dt = 60.0                  # [s]
         self.T = 4.0 * 24.0 * 3600.0    # [s]    
 
+        # adaptive time-stepping
+        self.cfl = 0.4                  # dt close to the fixed 60 s
+        self.dt_min = 1.0               # [s]
+        self.dt_max = 600.0             # [s]
+
         self.g = 9.81                   # [m/s^2]
         self.f = 0.0                    # [s^(-1)]
 
     
-def sol_init(sg):
+def sol_init(sg,ud,rng=np.random):
     std_blob = 8.0*sg.dy; # Standard deviation of blob (m)
-    height = 9750. + 1000.*np.exp(-((sg.xg-0.25*np.mean(sg.x))**2.+(sg.yg-np.mean(sg.y))**2.)/(2.* \
+    height = 9750. + 1000.*np.exp(-((sg.xs-0.25*sg.xmean)**2.+(sg.ys-sg.ymean)**2.)/(2.* \
                                                      std_blob**2.))
 
     # this creates the solution container
     sol = Variables(sg)
-    sol.h[...] = height
+    sol.set_primitive(height, 0.0, 0.0)
+    sol.F = sg.coriolis(ud.f)
 
     return sol
\ No newline at end of file
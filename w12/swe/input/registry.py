@@ -0,0 +1,57 @@
+import ast
+import functools
+import importlib
+import os
+
+FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+
+def is_initial_condition(tree):
+    # an initial condition defines the class UserData and the function sol_init(sg, ud, ...)
+    names = {node.name : node for node in tree.body if isinstance(node, (ast.ClassDef, ast.FunctionDef))}
+    sol_init = names.get('sol_init')
+    return isinstance(names.get('UserData'), ast.ClassDef) and isinstance(sol_init, ast.FunctionDef) and len(sol_init.args.args) >= 2
+
+
+def get_aliases(tree):
+    # short names of the initial condition, e.g. ALIASES = ('bin',)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Name) and target.id == 'ALIASES' for target in node.targets):
+            return tuple(ast.literal_eval(node.value))
+    return ()
+
+
+@functools.lru_cache(maxsize=None)
+def get_initial_conditions():
+    """
+    Returns the initial conditions in the `input` folder as a dict of their names and aliases to the names of their modules. By convention, every module `input/name.py` that defines a class `UserData` and a function `sol_init(sg, ud, ...)` is an initial condition `name`, and it may list further names in a tuple `ALIASES`. The modules are parsed but not imported, so neither they nor their dependencies cost start-up time.
+
+    """
+    registry = {}
+    for filename in sorted(os.listdir(FOLDER)):
+        module, ext = os.path.splitext(filename)
+        if ext != '.py' or module.startswith('_'):
+            continue
+        with open(os.path.join(FOLDER, filename)) as file:
+            tree = ast.parse(file.read(), filename)
+        if is_initial_condition(tree):
+            for name in (module,) + get_aliases(tree):
+                registry[name] = module
+    return registry
+
+
+def load(name):
+    """
+    Imports the module of the initial condition `name` only.
+
+    Returns
+    -------
+    UserData: class
+    sol_init: function
+
+    """
+    registry = get_initial_conditions()
+    if name not in registry:
+        raise ValueError("unknown initial conditions %s, choose from %s" %(name, sorted(registry)))
+    module = importlib.import_module('input.' + registry[name])
+    return module.UserData, module.sol_init
@@ -1,3 +1,5 @@
+import numbers
+
 class UserDataInit(object):
     """
     Loads user defined initial conditions. Specifically, all attributes of the class object defined in the initial condition is loaded.
@@ -15,4 +17,49 @@ class UserDataInit(object):
 
     def update_ud(self, rewrite):
         for key, value in rewrite.items():
-            setattr(self, key, value)
\ No newline at end of file
+            setattr(self, key, value)
+
+def validate(ud, adaptive=False):
+    """
+    Checks that the user data `ud` has the parameters the solver needs, with values it can run with, and raises a ValueError that lists all problems otherwise. The parameters of the adaptive time-step are only needed if `adaptive` is set.
+
+    """
+    required = ['xmin', 'xmax', 'Nx', 'Ny', 'dt', 'T', 'g', 'f']
+    if getattr(ud, 'Ny', 1) > 1:
+        required += ['ymin', 'ymax']
+    if adaptive:
+        required += ['cfl', 'dt_min', 'dt_max']
+
+    missing = [key for key in required if not hasattr(ud, key)]
+    if missing:
+        raise ValueError("missing user data parameters %s" %missing)
+
+    errors = []
+    for key in ('Nx', 'Ny'):
+        if not isinstance(getattr(ud, key), numbers.Integral):
+            errors.append("%s = %r is not an integer" %(key, getattr(ud, key)))
+    # the inner domain needs at least one cell between the ghost cells
+    if ud.Nx < 3:
+        errors.append("Nx = %r, at least 3 cells including the ghost cells are needed" %ud.Nx)
+    if ud.Ny != 1 and ud.Ny < 3:
+        errors.append("Ny = %r, either 1 or at least 3 cells including the ghost cells are needed" %ud.Ny)
+    if not ud.xmax > ud.xmin:
+        errors.append("xmax = %r is not larger than xmin = %r" %(ud.xmax, ud.xmin))
+    if ud.Ny > 1 and not ud.ymax > ud.ymin:
+        errors.append("ymax = %r is not larger than ymin = %r" %(ud.ymax, ud.ymin))
+    if not ud.dt > 0.0:
+        errors.append("dt = %r is not positive" %ud.dt)
+    if not ud.T > 0.0:
+        errors.append("T = %r is not positive" %ud.T)
+    if not ud.g > 0.0:
+        errors.append("g = %r is not positive" %ud.g)
+    if getattr(ud, 'precision', 'float64') not in ('float64', 'float32'):
+        errors.append("precision = %r is neither 'float64' nor 'float32'" %ud.precision)
+    if adaptive:
+        if not 0.0 < ud.cfl <= 1.0:
+            errors.append("cfl = %r is not in (0, 1]" %ud.cfl)
+        if not 0.0 < ud.dt_min <= ud.dt_max:
+            errors.append("dt_min = %r and dt_max = %r are not 0 < dt_min <= dt_max" %(ud.dt_min, ud.dt_max))
+
+    if errors:
+        raise ValueError("invalid user data: " + "; ".join(errors))
@@ -1,36 +1,205 @@
+import contextlib
+import math
+import os
+import time
+import numpy as np
 from data.grid import sGrid, tGrid
-from numerics.lax_wendroff import lax_wendroff
-from numerics.bc import set_boundary
-from data import io
+from data.vars import stack
+from input.user_data import UserDataInit, validate
+from numerics.lax_wendroff import get_stepper
+from numerics.cfl import AdaptiveTimeStep
+from numerics.diagnostics import Diagnostics
+from data import io, raw, checkpoint
+from data.timing import Timer
 
 
-if __name__ == '__main__':
-    user_data, sol_init = io.get_args()
-    ud = user_data()
+def write_outputs(writer, sol, nn, outputs):
+    # the velocities are only computed for the variables that are written at this time-step
+    for name, (every, stride) in outputs.items():
+        if nn % every == 0:
+            writer.write(nn, name, getattr(sol, name), stride)
+
+
+def get_writer(args, outputs, ud, folder, filename):
+    if args.format == 'memmap':
+        # the outputs of the whole run are preallocated, a restart maps the existing file
+        return raw.writer(folder=folder, filename=os.path.splitext(filename)[0] + '.raw', outputs=outputs, steps=len(tGrid(ud).t), append=args.restart)
+    compression = None if args.compression == 'none' else args.compression
+    layout = 'series' if args.swmr else args.layout
+    return io.writer(folder=folder, filename=filename, buffered=args.buffered, layout=layout, append=args.restart, compression=compression, level=args.level, shuffle=args.shuffle, max_error=args.max_error, chunks=args.chunks, swmr=args.swmr)
+
+
+def dry_run(ud, args):
+    """
+    Checks the user data `ud` and the options `args` from `io.get_args` as `run` would use them, and prints the grid, the number of time-steps and the outputs, without running the solver or writing any file.
 
-    writer = io.writer()
+    """
+    if args.precision is not None:
+        ud.precision = args.precision
+    validate(ud, args.adaptive)
+    outputs = io.get_outputs(args.every, args.stride)
 
     sg = sGrid(ud)
     tg = tGrid(ud)
-    writer.write_attr(sg)
-    writer.write_attr(tg)
+    steps = len(tg.t) - 1
+
+    print("initial conditions: %s" %args.ic)
+    print("grid: %i x %i cells, dx = %g, dy = %g, %s" %(sg.Nx, sg.Ny, sg.dx, sg.dy, sg.precision))
+    print("time: T = %g, dt = %g, %i time-steps%s" %(tg.T, tg.dt, steps, ", adaptive with cfl = %g" %ud.cfl if args.adaptive else ""))
+    if args.members > 1:
+        print("ensemble: %i members" %args.members)
+    total = 0
+    for name, (every, stride) in outputs.items():
+        # the variables are written at the time-steps 0, every, 2 every, ... with every stride-th point
+        count = steps // every + 1
+        size = count * args.members * -(-sg.Ny // stride) * -(-sg.Nx // stride) * sg.dtype.itemsize
+        total += size
+        print("output %s: every %i time-steps, stride %i, %i outputs, %.2f MiB uncompressed" %(name, every, stride, count, size / 2**20))
+    print("outputs: %.2f MiB uncompressed" %(total / 2**20))
+
+
+def run(ud, sol_init, args, folder='./output/', filename='output.h5'):
+    """
+    Runs the shallow water solver for the user data `ud` and initial conditions `sol_init` with the options `args` from `io.get_args`, and writes the output to `folder/filename`.
+
+    """
+    timer = Timer(args.profile)
+    tic = time.perf_counter()
+
+    outputs = io.get_outputs(args.every, args.stride)
+    # the time loop stops at every time-step at which any variable is written
+    interval = math.gcd(*(every for every, _ in outputs.values()))
 
-    sol = sol_init(sg,ud)
+    with get_writer(args, outputs, ud, folder, filename) as writer, contextlib.ExitStack() as cleanup:
+        chk_path = checkpoint.get_path(writer)
 
-    for nn, t in enumerate(tg.t):
+        if args.restart:
+            # continue from the last checkpoint, outputs written after it are discarded
+            sol, ud, chk = checkpoint.load(chk_path)
+            writer.truncate(chk.nn)
+            writer.truncate_table('diagnostics', 't', chk.t)
+            nn0, t = chk.nn, chk.t
+        elif args.precision is not None:
+            ud.precision = args.precision
 
-        if nn % 60 == 0:
-            writer.write(nn, "h", sol.h)
-            writer.write(nn, "u", sol.u)
-            writer.write(nn, "v", sol.v)
-            print("time-step %.2f" %nn)
+        sg = sGrid(ud)
+        tg = tGrid(ud)
+        if args.restart:
+            # the time-step of the last step before the checkpoint, e.g. of the adaptive time-stepping
+            tg.dt = chk.dt
 
-        lax_wendroff(sol, tg, sg, ud)
-        set_boundary(sol)
+        if not args.restart:
+            writer.write_attr(sg)
+            writer.write_attr(tg)
 
+            if args.members > 1:
+                # every ensemble member gets its own random seed
+                seed = np.random.randint(2**31 - args.members) if args.seed is None else args.seed
+                seeds = seed + np.arange(args.members)
+                sol = stack([sol_init(sg, ud, np.random.RandomState(member_seed)) for member_seed in seeds])
+                writer.write_attr(UserDataInit(members=args.members, seeds=seeds))
+            else:
+                if args.seed is not None:
+                    np.random.seed(args.seed)
+                sol = sol_init(sg,ud)
 
+            nn0, t = 0, 0.0
 
+        lax_wendroff = get_stepper(sg, args.backend, args.workers, sol.h.shape, timer)
+        if hasattr(lax_wendroff, 'close'):
+            # the threads of the strip-parallel stepper are shut down also if the run fails, e.g. in the processes of a sweep
+            cleanup.callback(lax_wendroff.close)
 
+        diagnostics = None
+        if args.diagnostics or args.max_drift is not None:
+            reference = chk.reference if args.restart else None
+            diagnostics = Diagnostics(sg, ud, sol.h.shape, args.max_drift, reference)
+            diagnostics.attach(lax_wendroff)
+            if args.swmr:
+                # no datasets can be created once the file is in SWMR mode
+                writer.create_table('diagnostics', diagnostics.empty())
 
+        if args.adaptive:
+            # outputs are written at the same times as with the fixed time-step
+            adaptive_dt = AdaptiveTimeStep(sg, ud, sol.h.shape)
+            for nn in range(nn0, len(tg.t), interval):
+                while t < tg.t[nn]:
+                    remaining = tg.t[nn] - t
+                    with timer.phase('cfl'):
+                        tg.dt = adaptive_dt(sol, sg, ud, remaining)
+                    if diagnostics is not None:
+                        with timer.phase('diagnostics'):
+                            diagnostics.compute(sol)
+                    lax_wendroff(sol, tg, sg, ud)
+                    if diagnostics is not None and diagnostics.record(t):
+                        break
+                    # the last step before an output lands exactly on the output time
+                    t = tg.t[nn] if tg.dt == remaining else t + tg.dt
 
+                if diagnostics is not None and diagnostics.stop:
+                    print("stopping early: %s" %diagnostics.stop)
+                    break
 
+                with timer.phase('output'):
+                    write_outputs(writer, sol, nn, outputs)
+                    if diagnostics is not None:
+                        writer.write_table('diagnostics', diagnostics.pop())
+                    writer.sync()
+                with timer.phase('diagnostics'):
+                    max_u = np.sqrt(np.max(sol.u**2 + sol.v**2))
+                print("time-step %.2f, dt = %.2f; max(|u|) = %f" %(nn, tg.dt, max_u))
+
+                if args.checkpoint and nn % args.checkpoint == 0 and nn > nn0:
+                    with timer.phase('checkpoint'):
+                        writer.flush()
+                        checkpoint.save(chk_path, sol, ud, nn, t, tg.dt, getattr(diagnostics, 'reference', None))
+
+        else:
+            for nn in range(nn0, len(tg.t)):
+
+                if nn % interval == 0:
+                    with timer.phase('output'):
+                        write_outputs(writer, sol, nn, outputs)
+                        # the diagnostics are in the file with the outputs, not only at the end of the run
+                        if diagnostics is not None:
+                            writer.write_table('diagnostics', diagnostics.pop())
+                        writer.sync()
+                    with timer.phase('diagnostics'):
+                        max_u = np.sqrt(np.max(sol.u**2 + sol.v**2))
+                    print("time-step %.2f; max(|u|) = %f" %(nn, max_u))
+
+                if args.checkpoint and nn % args.checkpoint == 0 and nn > nn0:
+                    with timer.phase('checkpoint'):
+                        # the records since the last output
+                        if diagnostics is not None:
+                            writer.write_table('diagnostics', diagnostics.pop())
+                        writer.flush()
+                        checkpoint.save(chk_path, sol, ud, nn, tg.t[nn], tg.dt, getattr(diagnostics, 'reference', None))
+
+                if diagnostics is not None:
+                    with timer.phase('diagnostics'):
+                        diagnostics.compute(sol)
+                lax_wendroff(sol, tg, sg, ud)
+                if diagnostics is not None and diagnostics.record(tg.t[nn]):
+                    print("stopping early: %s" %diagnostics.stop)
+                    break
+
+        if diagnostics is not None:
+            writer.write_table('diagnostics', diagnostics.pop())
+
+        if timer.enabled:
+            # wait for the background writer, so its time is included
+            with timer.phase('output'):
+                writer.flush()
+            total = time.perf_counter() - tic
+            print(timer.summary(total))
+            writer.write_attr(timer.attrs())
+
+
+if __name__ == '__main__':
+    user_data, sol_init, args = io.get_args()
+    ud = user_data()
+    if args.dry_run:
+        dry_run(ud, args)
+    else:
+        run(ud, sol_init, args)
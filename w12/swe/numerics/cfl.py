@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class CFL(object):
+    """
+    Vectorised CFL monitor. Computes the CFL number `(sx / dx + sy / dy) * dt` with the largest signal speeds `sx = max(|u| + sqrt(g h))` and `sy = max(|v| + sqrt(g h))`, using two work buffers allocated for the grid `sg`, or for arrays of the given `shape`. The unsplit 2D Lax-Wendroff scheme is limited by the sum of the two directions, not by each of them on its own.
+
+    """
+
+    def __init__(self, sg, shape=None):
+        shape = sg.shape if shape is None else shape
+        self.c = np.empty(shape, dtype=sg.dtype)
+        self.tmp = np.empty_like(self.c)
+
+    def speeds(self, sol, ud):
+        c, tmp = self.c, self.tmp
+
+        # gravity wave speed
+        np.multiply(sol.h, ud.g, out=c)
+        np.sqrt(c, out=c)
+
+        # |u| = |hu| / h, as h > 0
+        np.abs(sol.hu, out=tmp)
+        np.divide(tmp, sol.h, out=tmp)
+        np.add(tmp, c, out=tmp)
+        sx = tmp.max()
+
+        np.abs(sol.hv, out=tmp)
+        np.divide(tmp, sol.h, out=tmp)
+        np.add(tmp, c, out=tmp)
+        sy = tmp.max()
+
+        if not (np.isfinite(sx) and np.isfinite(sy)):
+            raise FloatingPointError("the solution is not finite, the run has become unstable")
+        # as Python floats, so the time-step is double precision for single precision solutions
+        return float(sx), float(sy)
+
+    def __call__(self, sol, sg, ud, dt):
+        sx, sy = self.speeds(sol, ud)
+        return (sx / sg.dx + sy / sg.dy) * dt
+
+
+class AdaptiveTimeStep(object):
+    """
+    Chooses the time-step from the current solution, such that the CFL number is `ud.cfl`, within the bounds `ud.dt_min` and `ud.dt_max`. The time-step is shortened so that the next output time is reached exactly. For an ensemble, all members share the time-step. The Richtmyer Lax-Wendroff scheme becomes unstable above a CFL number of about 0.8, e.g. for the `gw` case.
+
+    Attributes
+    ----------
+    sg: sGrid
+    ud: UserData
+    shape: tuple, optional
+
+    """
+
+    def __init__(self, sg, ud, shape=None):
+        self.monitor = CFL(sg, shape)
+        self.cfl = ud.cfl
+        self.dt_min = ud.dt_min
+        self.dt_max = ud.dt_max
+
+    def __call__(self, sol, sg, ud, remaining):
+        sx, sy = self.monitor.speeds(sol, ud)
+        dt = self.cfl / (sx / sg.dx + sy / sg.dy)
+
+        if dt < self.dt_min:
+            raise RuntimeError("the time-step %.3e required by CFL = %.2f is below dt_min = %.3e" %(dt, self.cfl, self.dt_min))
+        dt = min(dt, self.dt_max)
+
+        # split the remaining time until the next output into steps of equal size
+        nsteps = int(np.ceil(remaining / dt))
+        return float(remaining / nsteps)
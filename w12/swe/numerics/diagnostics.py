@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class Diagnostics(object):
+    """
+    In-run diagnostics of the shallow water solution: the total mass `sum(h)`, the total energy `sum(0.5 h (u^2+v^2) + 0.5 g h^2)`, the mean potential vorticity `q = (F + dv/dx - du/dy) / h` and the potential enstrophy `sum(0.5 h q^2)`, all over the inner domain. For an ensemble, every member gets its own values.
+
+    Attached to a `LaxWendroff` stepper, the reductions are done inside the time-step on the velocities `u`, `v` and on `g/2 h^2` that the stepper has already computed. Otherwise, `compute` has to be called before the time-step. `record` stores the values of the state before the time-step and checks them: the run should be stopped if `stop` is set, i.e. if a value is not finite or if the mass or the energy have drifted by more than `max_drift` relative to the first record.
+
+    Attributes
+    ----------
+    sg: sGrid
+    ud: UserData
+    shape: tuple, optional. Shape of the solution arrays, if different from the grid.
+    max_drift: float, optional
+    reference: dict, optional. Mass and energy the drift is measured against, e.g. from a checkpoint.
+
+    """
+
+    names = ('mass', 'energy', 'pv', 'enstrophy')
+
+    def __init__(self, sg, ud, shape=None, max_drift=None, reference=None):
+        shape = sg.shape if shape is None else tuple(shape)
+        lead, (J, I) = shape[:-2], shape[-2:]
+        dtype = sg.dtype
+
+        self.g = ud.g
+        self.cx = 1.0 / (2.0 * sg.dx)
+        self.cy = 1.0 / (2.0 * sg.dy)
+        self.lead = lead
+        self.max_drift = max_drift
+        self.reference = reference
+
+        # for steppers that do not provide it
+        self.gh2 = np.empty(shape, dtype=dtype)
+
+        # potential vorticity on the inner domain
+        self.q = np.empty(lead + (J-2, I-2), dtype=dtype)
+        self.tmp = np.empty(lead + (J-2, I-2), dtype=dtype)
+
+        self.i1 = (..., slice(1,-1), slice(1,-1))
+        self.r_i1, self.l_i1 = (..., slice(1,-1), slice(2,None)), (..., slice(1,-1), slice(0,-2))
+        self.r_j1, self.l_j1 = (..., slice(2,None), slice(1,-1)), (..., slice(0,-2), slice(1,-1))
+
+        self.attached = False
+        self.values = None
+        self.records = {name : [] for name in ('t',) + self.names}
+        self.stop = None
+
+    def attach(self, stepper):
+        """
+        Lets `stepper` call `reduce` during the time-step, if it supports it. Returns whether it does.
+
+        """
+        if hasattr(stepper, 'diagnostics'):
+            stepper.diagnostics = self
+            self.attached = True
+        return self.attached
+
+    def compute(self, sol):
+        # not needed if the stepper does the reductions
+        if self.attached:
+            return
+        np.multiply(sol.h, sol.h, out=self.gh2)
+        np.multiply(self.gh2, self.g / 2.0, out=self.gh2)
+        self.reduce(sol.h, sol.u, sol.v, sol.F, sol.hu, sol.hv, self.gh2)
+
+    def reduce(self, h, u, v, F, hu, hv, gh2):
+        i1 = self.i1
+        h1 = h[i1]
+        q, tmp = self.q, self.tmp
+
+        # the sums of products are fused by einsum, no temporaries of the size of the grid,
+        # and are accumulated in double precision also for single precision solutions
+        acc = np.float64
+        mass = np.einsum('...ji->...', h1, dtype=acc)
+        kinetic = np.einsum('...ji,...ji->...', hu[i1], u[i1], dtype=acc) + np.einsum('...ji,...ji->...', hv[i1], v[i1], dtype=acc)
+        energy = 0.5 * kinetic + np.einsum('...ji->...', gh2[i1], dtype=acc)
+
+        # q = (F + dv/dx - du/dy) / h with central differences
+        np.subtract(v[self.r_i1], v[self.l_i1], out=q)
+        np.multiply(q, self.cx, out=q)
+        np.subtract(u[self.r_j1], u[self.l_j1], out=tmp)
+        np.multiply(tmp, self.cy, out=tmp)
+        np.subtract(q, tmp, out=q)
+        np.add(q, F[i1], out=q)
+        np.divide(q, h1, out=q)
+
+        pv = np.einsum('...ji->...', q, dtype=acc) / (q.shape[-2] * q.shape[-1])
+        enstrophy = 0.5 * np.einsum('...ji,...ji,...ji->...', h1, q, q, dtype=acc)
+
+        self.values = dict(zip(self.names, (mass, energy, pv, enstrophy)))
+
+    def record(self, t):
+        """
+        Stores the values of the last reduction at the time `t` and checks them. Returns the reason to stop the run, if there is one.
+
+        """
+        values = self.values
+        self.records['t'].append(t)
+        for name in self.names:
+            self.records[name].append(values[name])
+
+        for name in self.names:
+            if not np.all(np.isfinite(values[name])):
+                self.stop = "%s is not finite at t = %.2f" %(name, t)
+                return self.stop
+
+        if self.reference is None:
+            self.reference = {'mass' : values['mass'], 'energy' : values['energy']}
+
+        if self.max_drift is not None:
+            for name, ref in self.reference.items():
+                drift = np.max(np.abs(values[name] - ref) / np.abs(ref))
+                if drift > self.max_drift:
+                    self.stop = "%s has drifted by %.3e at t = %.2f" %(name, drift, t)
+                    return self.stop
+
+    def empty(self):
+        """
+        Returns records without rows, i.e. the columns of `pop`, e.g. to create the table of the diagnostics before the first record.
+
+        """
+        return {name : np.empty((0,) + self.lead) for name in ('t',) + self.names}
+
+    def pop(self):
+        """
+        Returns the records since the last call as arrays with a leading time axis, and clears them.
+
+        """
+        records = {name : np.array(values) for name, values in self.records.items()}
+        self.records = {name : [] for name in records}
+        return records
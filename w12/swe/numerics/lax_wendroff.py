@@ -1,11 +1,17 @@
+import warnings
 import numpy as np
+from numerics.bc import set_boundary
+from data.timing import Timer
 
 
 def lax_wendroff(sol, tg, sg, ud):
-    # We want the quantities that we are updating with the RLW method
+    # We want the quantities that we are updating with the RLW method,
+    # the conserved variables are stored, the velocities are needed for the fluxes
     h = sol.h
-    hu = sol.h * sol.u
-    hv = sol.h * sol.v
+    hu = sol.hu
+    hv = sol.hv
+    u = hu / h
+    v = hv / h
 
     # Now we need the to specify how we index our arrays.
 
@@ -14,13 +20,14 @@ def lax_wendroff(sol, tg, sg, ud):
     # we take the values on the left in the x direction
     l_i = (..., slice(0,-1))
     # we take the values on the right in the y direction
-    r_j = (slice(1,None),)
+    r_j = (..., slice(1,None), slice(None))
     # we take the values on the left in the y direction
-    l_j = (slice(0,-1),)
+    l_j = (..., slice(0,-1), slice(None))
 
     # define the inner domain, i.e. without the ghost cells,
-    i1 = (slice(1,-1), slice(1,-1))
-    in_i = (slice(1,-1),)
+    # leading axes, e.g. ensemble members, are left untouched
+    i1 = (..., slice(1,-1), slice(1,-1))
+    in_i = (..., slice(1,-1), slice(None))
     in_j = (..., slice(1,-1))
 
     # Get values defined by the user in the initial conditions file
@@ -33,16 +40,17 @@ def lax_wendroff(sol, tg, sg, ud):
 
     h_jh_nph = 0.5 * (h[r_j] + h[l_j]) - tg.dt / (2.0 * sg.dy) * (hv[r_j] - hv[l_j])
 
-    hu_flx_i = (hu) * sol.u + g / 2.0 * h**2
+    hu_flx_i = (hu) * u + g / 2.0 * h**2
     hu_ih_nph = 0.5 * (hu[r_i] + hu[l_i]) - tg.dt / (2.0 * sg.dx) * (hu_flx_i[r_i] - hu_flx_i[l_i])
 
-    hu_flx_j = hv * sol.u
+    # the flux of hu in the y-direction is the flux of hv in the x-direction
+    hu_flx_j = hu * v
     hu_jh_nph = 0.5 * (hu[r_j] + hu[l_j]) - tg.dt / (2.0 * sg.dy) * (hu_flx_j[r_j] - hu_flx_j[l_j])
 
-    hv_flx_i = hu * sol.v
+    hv_flx_i = hu_flx_j
     hv_ih_nph = 0.5 * (hv[r_i] + hv[l_i]) - tg.dt / (2.0 * sg.dx) * (hv_flx_i[r_i] - hv_flx_i[l_i])
 
-    hv_flx_j = (hv) * sol.v + g / 2.0 * h**2
+    hv_flx_j = (hv) * v + g / 2.0 * h**2
     hv_jh_nph = 0.5 * (hv[r_j] + hv[l_j]) - tg.dt / (2.0 * sg.dy) * (hv_flx_j[r_j] - hv_flx_j[l_j])
 
 
@@ -50,19 +58,255 @@ def lax_wendroff(sol, tg, sg, ud):
     h_np1 = h[i1] - tg.dt / sg.dx * (hu_ih_nph[r_i][in_i] - hu_ih_nph[l_i][in_i]) - tg.dt / sg.dy * (hv_jh_nph[r_j][in_j] - hv_jh_nph[l_j][in_j])
 
     # implement source term for Coriolis parameter
-    fvh = f * sol.v[i1] * (h_np1 + h[i1]) / 2.0
+    fvh = f * v[i1] * (h_np1 + h[i1]) / 2.0
     hu_flx_x = hu_ih_nph**2 / h_ih_nph + g / 2.0 * h_ih_nph**2
     hu_flx_y = hu_jh_nph * hv_jh_nph / h_jh_nph
     hu_np1 = hu[i1] - tg.dt / sg.dx * (hu_flx_x[r_i][in_i] - hu_flx_x[l_i][in_i]) - tg.dt / sg.dy * (hu_flx_y[r_j][in_j] - hu_flx_y[l_j][in_j]) + tg.dt * fvh
 
-    fuh = -f * sol.u[i1] * (h_np1 + h[i1]) / 2.0
+    fuh = -f * u[i1] * (h_np1 + h[i1]) / 2.0
     hv_flx_x = hu_ih_nph * hv_ih_nph / h_ih_nph
     hv_flx_y = hv_jh_nph**2 / h_jh_nph + g / 2.0 * h_jh_nph**2
     hv_np1 = hv[i1] - tg.dt / sg.dx * (hv_flx_x[r_i][in_i] - hv_flx_x[l_i][in_i]) - tg.dt / sg.dy * (hv_flx_y[r_j][in_j] - hv_flx_y[l_j][in_j]) + tg.dt * fuh
 
-    u_np1 = hu_np1 / h_np1
-    v_np1 = hv_np1 / h_np1
-
     sol.h[i1] = h_np1
-    sol.u[i1] = u_np1
-    sol.v[i1] = v_np1
\ No newline at end of file
+    sol.hu[i1] = hu_np1
+    sol.hv[i1] = hv_np1
+
+
+class LaxWendroff(object):
+    """
+    Richtmyer Lax-Wendroff stepper. Same as `lax_wendroff` followed by `set_boundary`, but all work buffers are allocated once for the grid `sg` and every step is computed in-place. The operations are done in the same order as in `lax_wendroff`, so the results are identical.
+
+    Attributes
+    ----------
+    sg: sGrid
+    shape: tuple, optional. Shape of the arrays to be updated, if different from the grid, e.g. for a part of the domain or with a leading ensemble member axis.
+    timer: Timer, optional. Accumulates the time spent in the half-step, the full-step and the boundary conditions.
+    diagnostics: Diagnostics, optional. Set by `Diagnostics.attach`, reduces the state before the time-step using the products computed in the half-step.
+
+    """
+
+    def __init__(self, sg, shape=None, timer=None):
+        self.timer = Timer() if timer is None else timer
+        self.diagnostics = None
+        shape = sg.shape if shape is None else tuple(shape)
+        lead, (J, I) = shape[:-2], shape[-2:]
+        dtype = sg.dtype
+
+        # cell-centred buffers
+        self.u = np.empty(lead + (J, I), dtype=dtype)
+        self.v = np.empty(lead + (J, I), dtype=dtype)
+        self.gh2 = np.empty(lead + (J, I), dtype=dtype)
+        self.flx = np.empty(lead + (J, I), dtype=dtype)
+
+        # half-step buffers on the interfaces in the x direction
+        self.h_ih = np.empty(lead + (J, I-1), dtype=dtype)
+        self.hu_ih = np.empty(lead + (J, I-1), dtype=dtype)
+        self.hv_ih = np.empty(lead + (J, I-1), dtype=dtype)
+        self.flx_i = np.empty(lead + (J, I-1), dtype=dtype)
+        self.tmp_i = np.empty(lead + (J, I-1), dtype=dtype)
+
+        # half-step buffers on the interfaces in the y direction
+        self.h_jh = np.empty(lead + (J-1, I), dtype=dtype)
+        self.hu_jh = np.empty(lead + (J-1, I), dtype=dtype)
+        self.hv_jh = np.empty(lead + (J-1, I), dtype=dtype)
+        self.flx_j = np.empty(lead + (J-1, I), dtype=dtype)
+        self.tmp_j = np.empty(lead + (J-1, I), dtype=dtype)
+
+        # full-step buffers on the inner domain
+        self.h_np1 = np.empty(lead + (J-2, I-2), dtype=dtype)
+        self.hu_np1 = np.empty(lead + (J-2, I-2), dtype=dtype)
+        self.hv_np1 = np.empty(lead + (J-2, I-2), dtype=dtype)
+        self.hsum = np.empty(lead + (J-2, I-2), dtype=dtype)
+        self.tmp = np.empty(lead + (J-2, I-2), dtype=dtype)
+
+        # right and left values in the x and y direction
+        self.r_i, self.l_i = (..., slice(1,None)), (..., slice(0,-1))
+        self.r_j, self.l_j = (..., slice(1,None), slice(None)), (..., slice(0,-1), slice(None))
+
+        # inner domain, and the right and left interfaces of the inner cells
+        self.i1 = (..., slice(1,-1), slice(1,-1))
+        self.r_i1, self.l_i1 = (..., slice(1,-1), slice(1,None)), (..., slice(1,-1), slice(0,-1))
+        self.r_j1, self.l_j1 = (..., slice(1,None), slice(1,-1)), (..., slice(0,-1), slice(1,-1))
+
+
+    def __call__(self, sol, tg, sg, ud):
+        self.step(sol, tg, sg, ud)
+        with self.timer.phase('full-step'):
+            self.update(sol)
+        with self.timer.phase('boundary'):
+            set_boundary(sol)
+
+
+    def half_step(self, out, q, flx, c, r, l, tmp):
+        # out = 0.5 * (q[r] + q[l]) - c * (flx[r] - flx[l])
+        np.add(q[r], q[l], out=out)
+        np.multiply(out, 0.5, out=out)
+        np.subtract(flx[r], flx[l], out=tmp)
+        np.multiply(tmp, c, out=tmp)
+        np.subtract(out, tmp, out=out)
+
+
+    def full_step(self, out, q, flx_x, flx_y, cx, cy):
+        # out = q[i1] - cx * (flx_x[r] - flx_x[l]) - cy * (flx_y[r] - flx_y[l])
+        tmp = self.tmp
+        np.subtract(flx_x[self.r_i1], flx_x[self.l_i1], out=tmp)
+        np.multiply(tmp, cx, out=tmp)
+        np.subtract(q[self.i1], tmp, out=out)
+        np.subtract(flx_y[self.r_j1], flx_y[self.l_j1], out=tmp)
+        np.multiply(tmp, cy, out=tmp)
+        np.subtract(out, tmp, out=out)
+
+
+    def step(self, sol, tg, sg, ud):
+        """
+        Computes the next time-step into the buffers `h_np1`, `hu_np1` and `hv_np1`. The solution is not modified; call `update` to copy the buffers into `sol`.
+
+        """
+        h, hu, hv = sol.h, sol.hu, sol.hv
+        u, v, gh2, flx = self.u, self.v, self.gh2, self.flx
+        r_i, l_i, r_j, l_j, i1 = self.r_i, self.l_i, self.r_j, self.l_j, self.i1
+
+        g = ud.g
+        f = sol.F[i1]
+        dt = tg.dt
+
+        with self.timer.phase('half-step'):
+            np.divide(hu, h, out=u)
+            np.divide(hv, h, out=v)
+            np.multiply(h, h, out=gh2)
+            np.multiply(gh2, g / 2.0, out=gh2)
+
+            # implement substep (2)
+            cx = tg.dt / (2.0 * sg.dx)
+            cy = tg.dt / (2.0 * sg.dy)
+
+            self.half_step(self.h_ih, h, hu, cx, r_i, l_i, self.tmp_i)
+            self.half_step(self.h_jh, h, hv, cy, r_j, l_j, self.tmp_j)
+
+            np.multiply(hu, u, out=flx)
+            np.add(flx, gh2, out=flx)
+            self.half_step(self.hu_ih, hu, flx, cx, r_i, l_i, self.tmp_i)
+
+            # the flux of hu in the y-direction is the flux of hv in the x-direction
+            np.multiply(hu, v, out=flx)
+            self.half_step(self.hu_jh, hu, flx, cy, r_j, l_j, self.tmp_j)
+            self.half_step(self.hv_ih, hv, flx, cx, r_i, l_i, self.tmp_i)
+
+            np.multiply(hv, v, out=flx)
+            np.add(flx, gh2, out=flx)
+            self.half_step(self.hv_jh, hv, flx, cy, r_j, l_j, self.tmp_j)
+
+        if self.diagnostics is not None:
+            with self.timer.phase('diagnostics'):
+                self.diagnostics.reduce(h, u, v, sol.F, hu, hv, gh2)
+
+        with self.timer.phase('full-step'):
+            # implement substep (3)
+            cx = tg.dt / sg.dx
+            cy = tg.dt / sg.dy
+
+            self.full_step(self.h_np1, h, self.hu_ih, self.hv_jh, cx, cy)
+            np.add(self.h_np1, h[i1], out=self.hsum)
+
+            flx_i, tmp_i, flx_j, tmp_j = self.flx_i, self.tmp_i, self.flx_j, self.tmp_j
+
+            # hu_flx_x = hu_ih**2 / h_ih + g / 2.0 * h_ih**2
+            np.multiply(self.hu_ih, self.hu_ih, out=flx_i)
+            np.divide(flx_i, self.h_ih, out=flx_i)
+            np.multiply(self.h_ih, self.h_ih, out=tmp_i)
+            np.multiply(tmp_i, g / 2.0, out=tmp_i)
+            np.add(flx_i, tmp_i, out=flx_i)
+            # hu_flx_y = hu_jh * hv_jh / h_jh
+            np.multiply(self.hu_jh, self.hv_jh, out=flx_j)
+            np.divide(flx_j, self.h_jh, out=flx_j)
+            self.full_step(self.hu_np1, hu, flx_i, flx_j, cx, cy)
+
+            # implement source term for Coriolis parameter, fvh = f * v * (h_np1 + h) / 2.0
+            tmp = self.tmp
+            np.multiply(f, v[i1], out=tmp)
+            np.multiply(tmp, self.hsum, out=tmp)
+            np.divide(tmp, 2.0, out=tmp)
+            np.multiply(tmp, dt, out=tmp)
+            np.add(self.hu_np1, tmp, out=self.hu_np1)
+
+            # hv_flx_x = hu_ih * hv_ih / h_ih
+            np.multiply(self.hu_ih, self.hv_ih, out=flx_i)
+            np.divide(flx_i, self.h_ih, out=flx_i)
+            # hv_flx_y = hv_jh**2 / h_jh + g / 2.0 * h_jh**2
+            np.multiply(self.hv_jh, self.hv_jh, out=flx_j)
+            np.divide(flx_j, self.h_jh, out=flx_j)
+            np.multiply(self.h_jh, self.h_jh, out=tmp_j)
+            np.multiply(tmp_j, g / 2.0, out=tmp_j)
+            np.add(flx_j, tmp_j, out=flx_j)
+            self.full_step(self.hv_np1, hv, flx_i, flx_j, cx, cy)
+
+            # fuh = -f * u * (h_np1 + h) / 2.0
+            np.multiply(f, u[i1], out=tmp)
+            np.negative(tmp, out=tmp)
+            np.multiply(tmp, self.hsum, out=tmp)
+            np.divide(tmp, 2.0, out=tmp)
+            np.multiply(tmp, dt, out=tmp)
+            np.add(self.hv_np1, tmp, out=self.hv_np1)
+
+
+    def update(self, sol):
+        i1 = self.i1
+        sol.h[i1] = self.h_np1
+        sol.hu[i1] = self.hu_np1
+        sol.hv[i1] = self.hv_np1
+
+
+
+class EnsembleLaxWendroff(object):
+    """
+    Richtmyer Lax-Wendroff stepper for an ensemble, i.e. for a solution with a leading member axis. The members are advanced in blocks of several members by one `LaxWendroff` call each. The block size is chosen such that the work buffers of a block fit into `cache_bytes`: on small grids, the number of NumPy calls per member is reduced, while on large grids the buffers are not evicted from the cache between the substeps.
+
+    Attributes
+    ----------
+    sg: sGrid
+    shape: tuple, `(M, Ny, Nx)`
+    cache_bytes: int, optional
+    timer: Timer, optional
+
+    """
+
+    def __init__(self, sg, shape, cache_bytes=2**21, timer=None):
+        J, I = shape[-2:]
+        self.members = int(np.prod(shape[:-2]))
+        # LaxWendroff holds about 24 arrays of the size of a member
+        member_bytes = 24 * J * I * sg.dtype.itemsize
+        self.block = int(max(1, min(self.members, cache_bytes // member_bytes)))
+
+        self.steppers = {}
+        for m0 in range(0, self.members, self.block):
+            size = min(self.block, self.members - m0)
+            if size not in self.steppers:
+                self.steppers[size] = LaxWendroff(sg, shape=(size, J, I), timer=timer)
+
+    def __call__(self, sol, tg, sg, ud):
+        for m0 in range(0, self.members, self.block):
+            part = sol.select(slice(m0, m0 + self.block))
+            self.steppers[part.h.shape[0]](part, tg, sg, ud)
+
+
+def get_stepper(sg, backend='numpy', workers=1, shape=None, timer=None):
+    """
+    Returns the time-stepper for the grid `sg`. The `numba` backend falls back to `numpy` if numba is not installed. With `workers > 1`, the domain is split into strips in the y-direction that are advanced by a pool of threads. `shape` is the shape of the solution arrays, if it has a leading ensemble member axis. The phases of the time-step are timed by `timer`.
+
+    """
+    if workers > 1:
+        if backend != 'numpy':
+            raise ValueError("the %s backend runs on a single thread" %backend)
+        from numerics.parallel import ParallelLaxWendroff
+        return ParallelLaxWendroff(sg, workers, shape, timer)
+
+    if backend == 'numba':
+        from numerics import lax_wendroff_jit
+        if lax_wendroff_jit.numba is not None:
+            return lax_wendroff_jit.LaxWendroffJit(sg, timer)
+        warnings.warn("numba is not installed, falling back to the numpy backend")
+
+    if shape is not None and len(shape) > 2:
+        return EnsembleLaxWendroff(sg, shape, timer=timer)
+    return LaxWendroff(sg, shape, timer)
@@ -0,0 +1,141 @@
+import numpy as np
+from data.timing import Timer
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def jit(func):
+    if numba is None:
+        return func
+    return numba.njit(cache=True)(func)
+
+
+@jit
+def x_fluxes(h, hu, hv, j, g2, c, out):
+    # half-step (2) on the interfaces i+1/2 of row j, stored as the fluxes of substep (3)
+    I = h.shape[1]
+    for i in range(I-1):
+        hu_l = hu[j,i]
+        hu_r = hu[j,i+1]
+        hv_l = hv[j,i]
+        hv_r = hv[j,i+1]
+        u_l = hu_l / h[j,i]
+        u_r = hu_r / h[j,i+1]
+        v_l = hv_l / h[j,i]
+        v_r = hv_r / h[j,i+1]
+
+        h_ih = 0.5 * (h[j,i+1] + h[j,i]) - c * (hu_r - hu_l)
+        hu_ih = 0.5 * (hu_r + hu_l) - c * ((hu_r * u_r + g2 * (h[j,i+1] * h[j,i+1])) - (hu_l * u_l + g2 * (h[j,i] * h[j,i])))
+        hv_ih = 0.5 * (hv_r + hv_l) - c * (hu_r * v_r - hu_l * v_l)
+
+        out[0,i] = hu_ih
+        out[1,i] = hu_ih * hu_ih / h_ih + (h_ih * h_ih) * g2
+        out[2,i] = hu_ih * hv_ih / h_ih
+
+
+@jit
+def y_fluxes(h, hu, hv, j, g2, c, out):
+    # half-step (2) on the interfaces j+1/2, stored as the fluxes of substep (3)
+    I = h.shape[1]
+    for i in range(I):
+        hu_l = hu[j,i]
+        hu_r = hu[j+1,i]
+        hv_l = hv[j,i]
+        hv_r = hv[j+1,i]
+        v_l = hv_l / h[j,i]
+        v_r = hv_r / h[j+1,i]
+
+        h_jh = 0.5 * (h[j+1,i] + h[j,i]) - c * (hv_r - hv_l)
+        hu_jh = 0.5 * (hu_r + hu_l) - c * (hu_r * v_r - hu_l * v_l)
+        hv_jh = 0.5 * (hv_r + hv_l) - c * ((hv_r * v_r + g2 * (h[j+1,i] * h[j+1,i])) - (hv_l * v_l + g2 * (h[j,i] * h[j,i])))
+
+        out[0,i] = hv_jh
+        out[1,i] = hu_jh * hv_jh / h_jh
+        out[2,i] = hv_jh * hv_jh / h_jh + (h_jh * h_jh) * g2
+
+
+@jit
+def lax_wendroff_kernel(h, hu, hv, F, g, dt, dx, dy, xf, yf_lo, yf_hi):
+    # One Richtmyer Lax-Wendroff step with the boundary conditions of `set_boundary`, done row by row. The fluxes on the interfaces j-1/2 and j+1/2 are kept in two rows that are swapped, so row j can be updated in-place once its fluxes are computed.
+    J, I = h.shape
+    g2 = g / 2.0
+    cx2 = dt / (2.0 * dx)
+    cy2 = dt / (2.0 * dy)
+    cx = dt / dx
+    cy = dt / dy
+
+    y_fluxes(h, hu, hv, 0, g2, cy2, yf_lo)
+
+    for j in range(1, J-1):
+        y_fluxes(h, hu, hv, j, g2, cy2, yf_hi)
+        x_fluxes(h, hu, hv, j, g2, cx2, xf)
+
+        # implement substep (3) and the source term for the Coriolis parameter
+        for i in range(1, I-1):
+            h_n = h[j,i]
+            hu_n = hu[j,i]
+            hv_n = hv[j,i]
+
+            h_np1 = h_n - cx * (xf[0,i] - xf[0,i-1]) - cy * (yf_hi[0,i] - yf_lo[0,i])
+            hsum = h_np1 + h_n
+
+            fvh = F[j,i] * (hv_n / h_n) * hsum / 2.0
+            hu_np1 = hu_n - cx * (xf[1,i] - xf[1,i-1]) - cy * (yf_hi[1,i] - yf_lo[1,i]) + fvh * dt
+
+            fuh = -(F[j,i] * (hu_n / h_n)) * hsum / 2.0
+            hv_np1 = hv_n - cx * (xf[2,i] - xf[2,i-1]) - cy * (yf_hi[2,i] - yf_lo[2,i]) + fuh * dt
+
+            h[j,i] = h_np1
+            hu[j,i] = hu_np1
+            hv[j,i] = hv_np1
+
+        # periodic BC in the x-direction
+        h[j,0] = h[j,I-2]
+        h[j,I-1] = h[j,1]
+        hu[j,0] = hu[j,I-2]
+        hu[j,I-1] = hu[j,1]
+        hv[j,0] = hv[j,I-2]
+        hv[j,I-1] = hv[j,1]
+
+        yf_lo, yf_hi = yf_hi, yf_lo
+
+    # periodic BC in the x-direction and no-flux BC in the y-direction on the first and last row
+    for j in (0, J-1):
+        h[j,0] = h[j,I-2]
+        h[j,I-1] = h[j,1]
+        hu[j,0] = hu[j,I-2]
+        hu[j,I-1] = hu[j,1]
+        for i in range(I):
+            hv[j,i] = 0.0
+
+
+class LaxWendroffJit(object):
+    """
+    Richtmyer Lax-Wendroff stepper compiled with numba. Computes the half-step, the full-step, the Coriolis source terms and `set_boundary` in one pass over the rows of the grid. The results agree with `LaxWendroff` up to round-off.
+
+    Attributes
+    ----------
+    sg: sGrid
+    timer: Timer, optional
+
+    """
+
+    def __init__(self, sg, timer=None):
+        self.timer = Timer() if timer is None else timer
+        J, I = sg.shape
+        dtype = sg.dtype
+        self.xf = np.empty((3, I-1), dtype=dtype)
+        self.yf_lo = np.empty((3, I), dtype=dtype)
+        self.yf_hi = np.empty((3, I), dtype=dtype)
+
+    def __call__(self, sol, tg, sg, ud):
+        # the ensemble members are advanced one after the other, the reshaped arrays are views
+        J, I = sol.h.shape[-2:]
+        h, hu, hv = sol.h.reshape(-1, J, I), sol.hu.reshape(-1, J, I), sol.hv.reshape(-1, J, I)
+        F = sol.F.reshape(-1, J, I)
+        with self.timer.phase('fused step'):
+            for mm in range(h.shape[0]):
+                lax_wendroff_kernel(h[mm], hu[mm], hv[mm], F[mm % F.shape[0]], ud.g, tg.dt, sg.dx, sg.dy, self.xf, self.yf_lo, self.yf_hi)
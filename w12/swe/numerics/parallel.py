@@ -0,0 +1,64 @@
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from numerics.lax_wendroff import LaxWendroff
+from numerics.bc import set_boundary
+from data.timing import Timer
+
+
+class Strip(object):
+    """
+    Part of the solution in the rows `j0-1` to `j1` (inclusive), i.e. the inner rows `j0` to `j1-1` and one ghost row on either side. The arrays are views of the full solution, so no halo data has to be copied.
+
+    """
+
+    def __init__(self, sol, j0, j1):
+        rows = (..., slice(j0-1, j1+1), slice(None))
+        self.h = sol.h[rows]
+        self.hu = sol.hu[rows]
+        self.hv = sol.hv[rows]
+        self.F = sol.F[rows]
+
+
+def get_strips(J, workers):
+    # split the inner rows 1 to J-2 into strips of (nearly) equal size
+    bounds = np.linspace(1, J-1, workers+1).round().astype(int)
+    return [(j0, j1) for j0, j1 in zip(bounds[:-1], bounds[1:]) if j1 > j0]
+
+
+class ParallelLaxWendroff(object):
+    """
+    Richtmyer Lax-Wendroff stepper on a domain split into strips in the y-direction. Every strip has its own `LaxWendroff` stepper and the strips are advanced by a pool of `workers` threads. NumPy releases the GIL in the array operations, so the strips are computed concurrently.
+
+    A time-step is done in two phases: first, all strips compute the next time-step into their buffers from the current solution. Then, the buffers are copied into the inner rows of the strips. The halo rows of a strip are the inner rows of its neighbours, so the results are identical to the serial `LaxWendroff`.
+
+    Attributes
+    ----------
+    sg: sGrid
+    workers: int
+    shape: tuple, optional. Shape of the solution arrays, if different from the grid.
+    timer: Timer, optional
+
+    """
+
+    def __init__(self, sg, workers, shape=None, timer=None):
+        self.timer = Timer() if timer is None else timer
+        shape = sg.shape if shape is None else tuple(shape)
+        lead, (J, I) = shape[:-2], shape[-2:]
+        self.strips = get_strips(J, workers)
+        self.steppers = [LaxWendroff(sg, shape=lead + (j1-j0+2, I)) for j0, j1 in self.strips]
+        self.pool = ThreadPoolExecutor(max_workers=len(self.strips))
+
+    def __call__(self, sol, tg, sg, ud):
+        parts = [Strip(sol, j0, j1) for j0, j1 in self.strips]
+
+        # all strips have to finish reading the current solution before any of them is updated
+        with self.timer.phase('step (strips)'):
+            list(self.pool.map(lambda k: self.steppers[k].step(parts[k], tg, sg, ud), range(len(parts))))
+        with self.timer.phase('update (strips)'):
+            list(self.pool.map(lambda k: self.steppers[k].update(parts[k]), range(len(parts))))
+
+        with self.timer.phase('boundary'):
+            set_boundary(sol)
+
+    def close(self):
+        self.pool.shutdown()
@@ -0,0 +1,153 @@
+import argparse
+import contextlib
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from data import io
+from input.user_data import UserDataInit
+
+
+def get_configs(grid):
+    """
+    Returns the configurations of the parameter `grid`, a dict of lists of values, as a list of dicts with one value per parameter.
+
+    """
+    keys = sorted(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def get_name(rewrite, argv):
+    # the name only depends on the configuration, so a resumed sweep finds its runs again
+    key = json.dumps({'rewrite' : rewrite, 'argv' : argv}, sort_keys=True)
+    return 'run_' + hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def load_index(path):
+    if os.path.exists(path):
+        with open(path) as file:
+            return json.load(file)
+    return {}
+
+
+def save_index(path, index):
+    # written to a temporary file first, so the index is never left half written
+    with open(path + '.tmp', 'w') as file:
+        json.dump(index, file, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def get_ext(args):
+    # raw outputs are written next to the name of the HDF5 output, see `main.get_writer`
+    return '.raw' if args.format == 'memmap' else '.h5'
+
+
+def run_config(rewrite, argv, folder, name, restart):
+    """
+    Runs `main.run` for the user data of the initial conditions in `argv`, updated with `rewrite`. The output is written to `folder/name.h5` and the printed output to `folder/name.log`. The checkpoint of a completed run is removed, so only interrupted runs have one.
+
+    """
+    import main
+
+    user_data, sol_init, args = io.get_args(argv)
+    ud = UserDataInit(**vars(user_data()))
+    ud.update_ud(rewrite)
+    args.restart = restart
+
+    tic = time.perf_counter()
+    with open(os.path.join(folder, name + '.log'), 'a') as log, contextlib.redirect_stdout(log):
+        main.run(ud, sol_init, args, folder=folder, filename=name + '.h5')
+    chk_path = os.path.join(folder, name + get_ext(args) + '.chk')
+    if os.path.exists(chk_path):
+        os.remove(chk_path)
+    return time.perf_counter() - tic
+
+
+def sweep(grid, argv, folder='./output/sweep/', jobs=1, force=False):
+    """
+    Runs the shallow water solver for every configuration of the parameter `grid` on a pool of `jobs` processes. `argv` are the arguments of `main.py` shared by all runs. Every run writes its own output file in `folder`, and `folder/index.json` keeps the parameters and the status of every run.
+
+    Configurations whose output already exists are skipped, unless `force` is set, in which case all runs are started again. Only a checkpoint shows that a run was interrupted, as it is removed once a run is completed, so such runs are continued from it. Existing outputs that are not in the index, e.g. if it was lost, are added to it with the status 'exists', and are never removed without `force`. With `--dry-run` in `argv`, the configurations are only checked by `main.dry_run`, and the returned dict has the status 'valid' or 'invalid' of every configuration instead.
+
+    Returns
+    -------
+    index: dict
+
+    """
+    user_data, _, args = io.get_args(argv)
+    ext = get_ext(args)
+    unknown = set(grid) - set(vars(user_data()))
+    if unknown:
+        raise ValueError("unknown user data parameters %s" %sorted(unknown))
+
+    if args.dry_run:
+        # every configuration is checked, nothing is run or written
+        import main
+        checked = {}
+        for rewrite in get_configs(grid):
+            name = get_name(rewrite, argv)
+            ud = UserDataInit(**vars(user_data()))
+            ud.update_ud(rewrite)
+            print("%s: %s" %(name, rewrite))
+            try:
+                main.dry_run(ud, args)
+                checked[name] = {'params' : rewrite, 'status' : 'valid'}
+            except ValueError as err:
+                print(err)
+                checked[name] = {'params' : rewrite, 'status' : 'invalid', 'error' : str(err)}
+        print("%i of %i configurations are invalid" %(sum(entry['status'] == 'invalid' for entry in checked.values()), len(checked)))
+        return checked
+
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+    index_path = os.path.join(folder, 'index.json')
+    index = load_index(index_path)
+
+    todo = []
+    for rewrite in get_configs(grid):
+        name = get_name(rewrite, argv)
+        path = os.path.join(folder, name + ext)
+        entry = index.get(name, {})
+        if entry.get('status') == 'done' and os.path.exists(path) and not force:
+            continue
+        restart = not force and os.path.exists(path + '.chk')
+        if not restart and os.path.exists(path) and not force:
+            # e.g. from an earlier sweep or with a lost index, the output is kept
+            if name not in index:
+                index[name] = {'params' : rewrite, 'argv' : argv, 'file' : name + ext, 'status' : 'exists'}
+            print("%s: skipped, %s exists, use --force to run it again" %(name, path))
+            continue
+        if force:
+            for old in (path, path + '.json', path + '.chk'):
+                if os.path.exists(old):
+                    os.remove(old)
+        index[name] = {'params' : rewrite, 'argv' : argv, 'file' : name + ext, 'status' : 'running'}
+        todo.append((rewrite, name, restart))
+    save_index(index_path, index)
+
+    print("%i of %i runs to do" %(len(todo), len(get_configs(grid))))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(run_config, rewrite, argv, folder, name, restart) : name for rewrite, name, restart in todo}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                index[name].update(status='done', wall_time=future.result())
+            except Exception as err:
+                index[name].update(status='failed', error=repr(err))
+            save_index(index_path, index)
+            print("%s: %s %s" %(name, index[name]['status'], index[name]['params']))
+
+    return index
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Parameter sweep of the shallow water solver, the remaining arguments are passed on to main.py')
+    parser.add_argument('--grid', action='store', dest='grid', type=json.loads, required=True, help='Parameter grid as JSON, e.g. \'{"dt": [30, 60], "f": [1e-4, 2e-4]}\'')
+    parser.add_argument('-j', '--jobs', action='store', dest='jobs', type=int, default=os.cpu_count(), help='Set the number of runs that are done in parallel')
+    parser.add_argument('--folder', action='store', dest='folder', default='./output/sweep/', help='Set the folder of the output files and the index')
+    parser.add_argument('--force', action='store_true', dest='force', help='Run all configurations again, their existing outputs are removed')
+    args, argv = parser.parse_known_args()
+
+    sweep(args.grid, argv, args.folder, args.jobs, args.force)
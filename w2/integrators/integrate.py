@@ -0,0 +1,106 @@
+import numpy as np
+from models import MODELS
+from schemes import SCHEMES
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def get_batch(model, params=None, initial=None):
+    """
+    Returns the parameters of `model` as an array of shape `(len(model.params),) + batch`, and the initial values of shape `batch`. `params` and `initial` update the defaults of the model with values that are broadcast against each other, e.g. one value per member of the batch, and `batch` is their common shape.
+
+    """
+    params = dict(model.params, **(params or {}))
+    unknown = set(params) - set(model.params)
+    if unknown:
+        raise ValueError("unknown parameters %s of the model %s" %(sorted(unknown), model.name))
+    initial = model.initial if initial is None else initial
+
+    values = np.broadcast_arrays(*[np.asarray(params[key], dtype=np.float64) for key in model.params], *[np.asarray(y, dtype=np.float64) for y in initial])
+    P = np.stack(values[:len(model.params)])
+    return P, values[-2].copy(), values[-1].copy()
+
+
+def get_grid(model, grid):
+    """
+    Returns the parameters of the combinations of the values of `grid`, a dict of lists of values per parameter, with the batch axes in the order of `grid`, e.g. for a sweep of the phase space.
+
+    """
+    values = np.meshgrid(*[np.asarray(grid[key], dtype=np.float64) for key in grid], indexing='ij')
+    return dict(zip(grid, values))
+
+
+_kernels = {}
+
+def get_kernel(model, scheme, block=256):
+    # the time loop compiled once per model and scheme. The members are stepped in blocks that
+    # stay in the cache, and a step is done for all members of a block before the next, as a
+    # single member is bound by the latency of the dependent operations of its steps.
+    key = (model.name, scheme.__name__)
+    if key not in _kernels:
+        f0, f1, step = numba.njit(model.f0), numba.njit(model.f1), numba.njit(scheme)
+
+        @numba.njit
+        def kernel(y0, y1, P, dt, Nt, every, out0, out1):
+            M = y0.shape[0]
+            for m0 in range(0, M, block):
+                m1 = min(m0 + block, M)
+                a = y0[m0:m1].copy()
+                b = y1[m0:m1].copy()
+                p = np.ascontiguousarray(P[:, m0:m1])
+                # a countdown to the next output instead of a modulo in every step
+                left = every
+                k = 1
+                for nn in range(Nt):
+                    t = nn * dt
+                    for m in range(m1 - m0):
+                        a[m], b[m] = step(f0, f1, t, a[m], b[m], p[:, m], dt)
+                    left -= 1
+                    if left == 0:
+                        out0[k, m0:m1] = a
+                        out1[k, m0:m1] = b
+                        left = every
+                        k += 1
+
+        _kernels[key] = kernel
+    return _kernels[key]
+
+
+def integrate(model, scheme, dt, Nt, params=None, initial=None, every=1, jit=False):
+    """
+    Integrates `model` with `scheme` for `Nt` steps of size `dt`, for a batch of parameters and initial values, see `get_batch`. Every `every`-th step is kept, so the outputs of long runs can be decimated.
+
+    By default, the time loop is done once for the whole batch with NumPy arrays. With `jit`, the time loop of every member is compiled by Numba, which is faster for many steps and small batches, but needs the model and the scheme to be compiled at the first call. Without Numba, `jit` is ignored.
+
+    Returns
+    -------
+    t: ndarray of shape `(Nt // every + 1,)`
+    y: dict of the components of the model, each an ndarray of shape `t.shape + batch`
+
+    """
+    model = MODELS.get(model, model)
+    scheme = SCHEMES.get(scheme, scheme)
+    P, y0, y1 = get_batch(model, params, initial)
+    batch = y0.shape
+
+    nout = Nt // every + 1
+    t = np.arange(nout) * (every * dt)
+    out0 = np.empty((nout,) + batch)
+    out1 = np.empty((nout,) + batch)
+    out0[0], out1[0] = y0, y1
+
+    if jit and numba is not None:
+        # the members as the columns of 2D arrays
+        size = y0.size
+        get_kernel(model, scheme)(y0.reshape(size), y1.reshape(size), P.reshape(-1, size), float(dt), int(Nt), int(every), out0.reshape(nout, size), out1.reshape(nout, size))
+    else:
+        for nn in range(Nt):
+            y0, y1 = scheme(model.f0, model.f1, nn * dt, y0, y1, P, dt)
+            if (nn + 1) % every == 0:
+                out0[(nn + 1) // every] = y0
+                out1[(nn + 1) // every] = y1
+
+    return t, dict(zip(model.names, (out0, out1)))
@@ -0,0 +1,55 @@
+import numpy as np
+
+
+class Model(object):
+    """
+    A system of two ODEs `y0' = f0(t, y0, y1, p)`, `y1' = f1(t, y0, y1, p)`. The right-hand sides use element-wise arithmetic only, and index the parameters `p` along their first axis, so they run on floats and on arrays of a batch alike, and can be compiled by Numba.
+
+    Attributes
+    ----------
+    name: str
+    f0: function
+    f1: function
+    names: tuple. Names of the components `y0` and `y1`.
+    params: dict. Names and default values of the parameters, in the order of `p`.
+    initial: tuple. Default initial values of `y0` and `y1`.
+
+    """
+
+    def __init__(self, name, f0, f1, names, params, initial):
+        self.name = name
+        self.f0 = f0
+        self.f1 = f1
+        self.names = names
+        self.params = params
+        self.initial = initial
+
+
+def oscillator_x(t, x, v, p):
+    return v
+
+
+def oscillator_v(t, x, v, p):
+    # m x'' = - c x - k x' + F0 cos(omega t), see week 1
+    return (- p[1] * x - p[2] * v + p[3] * np.cos(p[4] * t)) / p[0]
+
+
+def lotka_volterra_cheetahs(t, cheetahs, baboons, p):
+    return p[2] * baboons * cheetahs - p[3] * cheetahs
+
+
+def lotka_volterra_baboons(t, cheetahs, baboons, p):
+    return p[0] * baboons - p[1] * baboons * cheetahs
+
+
+OSCILLATOR = Model('oscillator', oscillator_x, oscillator_v, ('x', 'v'),
+                   {'m' : 1.0, 'c' : 1.0, 'k' : 0.0, 'F0' : 0.0, 'omega' : 0.0}, (0.0, 1.0))
+
+# the cheetahs come first, so that `schemes.stormer_verlet` is the scheme of the week 2 notebook
+LOTKA_VOLTERRA = Model('lotka_volterra', lotka_volterra_cheetahs, lotka_volterra_baboons, ('cheetahs', 'baboons'),
+                       {'baboons_gain' : 1.1, 'baboons_loss' : 0.4, 'cheetahs_gain' : 0.1, 'cheetahs_loss' : 0.4}, (10.0, 10.0))
+
+MODELS = {
+    'oscillator' : OSCILLATOR,
+    'lotka_volterra' : LOTKA_VOLTERRA,
+}
@@ -0,0 +1,57 @@
+# One-step methods for the systems of `models.Model`. A scheme advances (y0, y1) from the
+# time t by one step of size dt. The splitting schemes update one component after the other,
+# Euler A and Stormer-Verlet start with y0, Euler B with y1, and every update is explicit,
+# i.e. uses the newest values of both components.
+
+def euler(f0, f1, t, y0, y1, p, dt):
+    return y0 + dt * f0(t, y0, y1, p), y1 + dt * f1(t, y0, y1, p)
+
+
+def euler_a(f0, f1, t, y0, y1, p, dt):
+    y0 = y0 + dt * f0(t, y0, y1, p)
+    return y0, y1 + dt * f1(t, y0, y1, p)
+
+
+def euler_b(f0, f1, t, y0, y1, p, dt):
+    y1 = y1 + dt * f1(t, y0, y1, p)
+    return y0 + dt * f0(t, y0, y1, p), y1
+
+
+def stormer_verlet(f0, f1, t, y0, y1, p, dt):
+    # half a step of y0, a step of y1 and half a step of y0, i.e. euler_c of week 2 and the
+    # scheme of the Lotka-Volterra notebook. It is of second order if f0 does not depend on y0
+    # and f1 not on y1, e.g. for the undamped oscillator, otherwise of first order.
+    th = t + 0.5 * dt
+    y0 = y0 + 0.5 * dt * f0(t, y0, y1, p)
+    y1 = y1 + dt * f1(th, y0, y1, p)
+    return y0 + 0.5 * dt * f0(th, y0, y1, p), y1
+
+
+def midpoint(f0, f1, t, y0, y1, p, dt):
+    th = t + 0.5 * dt
+    y0h = y0 + 0.5 * dt * f0(t, y0, y1, p)
+    y1h = y1 + 0.5 * dt * f1(t, y0, y1, p)
+    return y0 + dt * f0(th, y0h, y1h, p), y1 + dt * f1(th, y0h, y1h, p)
+
+
+def rk4(f0, f1, t, y0, y1, p, dt):
+    th = t + 0.5 * dt
+    k0 = f0(t, y0, y1, p)
+    l0 = f1(t, y0, y1, p)
+    k1 = f0(th, y0 + 0.5 * dt * k0, y1 + 0.5 * dt * l0, p)
+    l1 = f1(th, y0 + 0.5 * dt * k0, y1 + 0.5 * dt * l0, p)
+    k2 = f0(th, y0 + 0.5 * dt * k1, y1 + 0.5 * dt * l1, p)
+    l2 = f1(th, y0 + 0.5 * dt * k1, y1 + 0.5 * dt * l1, p)
+    k3 = f0(t + dt, y0 + dt * k2, y1 + dt * l2, p)
+    l3 = f1(t + dt, y0 + dt * k2, y1 + dt * l2, p)
+    return y0 + dt / 6.0 * (k0 + 2.0 * k1 + 2.0 * k2 + k3), y1 + dt / 6.0 * (l0 + 2.0 * l1 + 2.0 * l2 + l3)
+
+
+SCHEMES = {
+    'euler' : euler,
+    'euler_a' : euler_a,
+    'euler_b' : euler_b,
+    'stormer_verlet' : stormer_verlet,
+    'midpoint' : midpoint,
+    'rk4' : rk4,
+}
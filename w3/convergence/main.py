@@ -0,0 +1,34 @@
+import argparse
+import os
+from steppers import STEPPERS
+from study import convergence_study
+from norms import NORMS
+from study import QUANTITIES
+
+
+def get_args(argv=None):
+    parser = argparse.ArgumentParser(description='Order-of-convergence study of the oscillator steppers of week 2', epilog='Example: "python main.py -s euler euler_b midpoint stormer_verlet -T 10 --norm final --quantity state" gives the orders 1, 1, 2 and 2.')
+    parser.add_argument('-s', '--steppers', nargs='+', choices=sorted(STEPPERS), default=['euler_a', 'euler_b'], help='Steppers to study')
+    parser.add_argument('--dts', nargs='+', type=float, default=[1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1], help='Step sizes')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--steps', type=int, default=None, help='Run every step size for this number of time-steps (default: 100000)')
+    group.add_argument('-T', type=float, default=None, help='Run every step size until this time')
+    parser.add_argument('--norm', choices=sorted(NORMS), default='max', help='Norm of the error over the time-steps')
+    parser.add_argument('--quantity', choices=sorted(QUANTITIES), default='energy', help='Quantity the error is measured in. The energy error can converge faster than the state, e.g. with order 3 for midpoint')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='Number of processes for the steppers that cannot be vectorised')
+    parser.add_argument('--no-vectorise', action='store_true', dest='no_vectorise', help='Step every step size on its own, also for linear steppers')
+    args = parser.parse_args(argv)
+
+    if args.steps is None and args.T is None:
+        args.steps = 100000
+    return args
+
+
+if __name__ == '__main__':
+    args = get_args()
+    linear = False if args.no_vectorise else None
+
+    for name in args.steppers:
+        result = convergence_study(STEPPERS[name], args.dts, args.steps, args.T, args.norm, args.quantity, args.workers, linear)
+        result.report()
+        print()
@@ -0,0 +1,45 @@
+import numpy as np
+
+# Streaming norms of the error over the time-steps of a run. The errors are passed to
+# `update` in blocks of shape `lead + (B,)`, together with the step size of every
+# entry, which is zero for the entries past the end of a run, so the trajectories
+# never have to be stored.
+
+class MaxNorm(object):
+    def __init__(self, shape):
+        self.value = np.zeros(shape)
+
+    def update(self, err, dt):
+        np.maximum(self.value, np.max(err, axis=-1, where=dt > 0.0, initial=0.0), out=self.value)
+
+
+class L2Norm(object):
+    # the L2 norm in time, sqrt(sum(err^2 dt))
+    def __init__(self, shape):
+        self.sum = np.zeros(shape)
+
+    def update(self, err, dt):
+        self.sum += np.sum(err**2 * dt, axis=-1)
+
+    @property
+    def value(self):
+        return np.sqrt(self.sum)
+
+
+class FinalNorm(object):
+    # the error at the end of the run, i.e. the global truncation error
+    def __init__(self, shape):
+        self.value = np.zeros(shape)
+
+    def update(self, err, dt):
+        # the entries of a run are a contiguous prefix of the block
+        count = np.count_nonzero(dt > 0.0, axis=-1)
+        last = np.take_along_axis(err, np.maximum(count - 1, 0)[..., np.newaxis], axis=-1)[..., 0]
+        self.value = np.where(count > 0, last, self.value)
+
+
+NORMS = {
+    'max' : MaxNorm,
+    'l2' : L2Norm,
+    'final' : FinalNorm,
+}
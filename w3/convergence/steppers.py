@@ -0,0 +1,50 @@
+import os
+import sys
+import numpy as np
+
+# the one-step methods of week 2 are the schemes of w2/integrators
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'w2', 'integrators'))
+
+import schemes
+from models import OSCILLATOR
+
+# the harmonic oscillator x' = v, v' = -x, i.e. the default parameters of the model
+PARAMS = tuple(OSCILLATOR.params.values())
+
+
+class Stepper(object):
+    """
+    One-step method `scheme` of `w2/integrators/schemes.py` for the harmonic oscillator. `stepper(x, v, dt)` returns the solution after one step of size `dt`. The schemes only use element-wise arithmetic, so x, v and dt may be arrays, e.g. one entry per step size of a study, and a step of size zero leaves the solution unchanged.
+
+    Attributes
+    ----------
+    scheme: function
+
+    """
+
+    def __init__(self, scheme):
+        self.scheme = scheme
+        self.__name__ = scheme.__name__
+
+    def __call__(self, x, v, dt):
+        # the oscillator does not depend on the time
+        return self.scheme(OSCILLATOR.f0, OSCILLATOR.f1, 0.0, x, v, PARAMS, dt)
+
+
+# Stormer-Verlet is euler_c of week 2
+STEPPERS = {name : Stepper(getattr(schemes, name)) for name in ('euler', 'euler_a', 'euler_b', 'midpoint', 'stormer_verlet')}
+
+euler = STEPPERS['euler']
+euler_a = STEPPERS['euler_a']
+euler_b = STEPPERS['euler_b']
+midpoint = STEPPERS['midpoint']
+stormer_verlet = STEPPERS['stormer_verlet']
+
+
+def initial():
+    return 0.0, 1.0
+
+
+def exact(t):
+    # the solution of the initial values x(0) = 0, v(0) = 1
+    return np.sin(t), np.cos(t)
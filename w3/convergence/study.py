@@ -0,0 +1,196 @@
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from norms import NORMS
+from steppers import initial, exact
+
+
+def energy_error(x, v, t):
+    xth, vth = exact(t)
+    return np.abs(0.5 * (x**2 + v**2) - 0.5 * (xth**2 + vth**2))
+
+
+def state_error(x, v, t):
+    xth, vth = exact(t)
+    return np.sqrt((x - xth)**2 + (v - vth)**2)
+
+
+QUANTITIES = {
+    'energy' : energy_error,
+    'state' : state_error,
+}
+
+
+def step_matrix(stepper, dts):
+    # the one-step map of a linear stepper, its columns are the steps of the unit vectors
+    dts = np.asarray(dts)
+    one, zero = np.ones(dts.shape, dtype=dts.dtype), np.zeros(dts.shape, dtype=dts.dtype)
+    A = np.empty(dts.shape + (2, 2), dtype=dts.dtype)
+    A[..., 0, 0], A[..., 1, 0] = stepper(one, zero, dts)
+    A[..., 0, 1], A[..., 1, 1] = stepper(zero, one, dts)
+    return A
+
+
+def is_linear(stepper, dts, rtol=1e-12):
+    # a linear stepper steps any solution like its step matrix does
+    dts = np.asarray(dts, dtype=np.float64)
+    s = np.random.RandomState(0).standard_normal(dts.shape + (2,))
+    x, v = stepper(s[..., 0], s[..., 1], dts)
+    As = np.einsum('...ij,...j->...i', step_matrix(stepper, dts), s)
+    return np.allclose(np.stack((x, v), axis=-1), As, rtol=rtol, atol=rtol)
+
+
+def step_powers(A, block):
+    # the powers A^1, ..., A^block of shape lead + (block, 2, 2), doubling the known powers each time
+    P = np.empty(A.shape[:-2] + (block, 2, 2), dtype=A.dtype)
+    P[..., 0, :, :] = A
+    n = 1
+    while n < block:
+        m = min(n, block - n)
+        P[..., n:n+m, :, :] = P[..., n-1:n, :, :] @ P[..., :m, :, :]
+        n += m
+    return P
+
+
+def integrate(stepper, dts, steps, norm='max', quantity='energy', linear=False, block=1024):
+    """
+    Advances the oscillator from `steppers.initial` with every step size of `dts` for its number of `steps`, and returns the errors of `quantity` against the exact solution in the `norm` over all steps. The runs are done `block` steps at a time, and the norms are accumulated block by block, so no trajectory is stored.
+
+    With `linear`, the solutions of a block are computed at once from the solution before the block, with the powers of the step matrix of the stepper. The rounding error of the step matrix is the same in every step and adds up to `steps * eps`, instead of `sqrt(steps) * eps` for random rounding errors, so the powers and the solutions are computed in extended precision, where `np.longdouble` provides it. Otherwise, the stepper is called for every step, with Python floats if there is only one step size.
+
+    Returns
+    -------
+    errors: ndarray of the shape of `dts`
+
+    """
+    dts = np.asarray(dts, dtype=float)
+    steps = np.broadcast_to(np.asarray(steps, dtype=int), dts.shape)
+    error = QUANTITIES[quantity]
+    norm = NORMS[norm](dts.shape)
+
+    scalar = dts.size == 1 and not linear
+    x, v = initial()
+    if linear:
+        P = step_powers(step_matrix(stepper, dts.astype(np.longdouble)), block)
+        x, v = np.full(dts.shape, x, dtype=np.longdouble), np.full(dts.shape, v, dtype=np.longdouble)
+    elif not scalar:
+        x, v = np.full(dts.shape, x), np.full(dts.shape, v)
+
+    j = np.arange(1, block + 1)
+    for n0 in range(0, int(steps.max(initial=0)), block):
+        # the step numbers of the block, and the step sizes, which are zero past the end of a run
+        n = n0 + j
+        dt = np.where(n <= steps[..., np.newaxis], dts[..., np.newaxis], 0.0)
+
+        if linear:
+            xb = P[..., 0, 0] * x[..., np.newaxis] + P[..., 0, 1] * v[..., np.newaxis]
+            vb = P[..., 1, 0] * x[..., np.newaxis] + P[..., 1, 1] * v[..., np.newaxis]
+            # continue from the last step of every run in the block
+            last = (np.clip(steps - n0, 1, block) - 1)[..., np.newaxis]
+            x = np.take_along_axis(xb, last, axis=-1)[..., 0]
+            v = np.take_along_axis(vb, last, axis=-1)[..., 0]
+            xb, vb = xb.astype(np.float64), vb.astype(np.float64)
+        else:
+            xb, vb = np.empty(dt.shape), np.empty(dt.shape)
+            for k, h in enumerate(dt.ravel().tolist() if scalar else np.moveaxis(dt, -1, 0)):
+                x, v = stepper(x, v, h)
+                xb[..., k] = x
+                vb[..., k] = v
+
+        # the errors of unstable runs overflow to inf
+        with np.errstate(over='ignore', invalid='ignore'):
+            norm.update(error(xb, vb, n * dts[..., np.newaxis]), dt)
+
+    return norm.value
+
+
+def fit_order(dts, errors, floor=0.0):
+    """
+    Returns the observed order of convergence, i.e. the least-squares slope of `log(error)` over `log(dt)`, and the orders between successive step sizes. Errors that are not finite or not above the round-off `floor`, a value or one per step size, are left out of the fit.
+
+    """
+    dts, errors = np.asarray(dts, dtype=float), np.asarray(errors, dtype=float)
+    floor = np.broadcast_to(floor, dts.shape)
+    idx = np.argsort(dts)
+    dts, errors, floor = dts[idx], errors[idx], floor[idx]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        orders = np.diff(np.log(errors)) / np.diff(np.log(dts))
+
+    valid = np.isfinite(errors) & (errors > floor)
+    if np.count_nonzero(valid) < 2:
+        return np.nan, orders
+    order = np.polyfit(np.log(dts[valid]), np.log(errors[valid]), 1)[0]
+    return order, orders
+
+
+class Convergence(object):
+    """
+    Result of a convergence study: the `errors` of the step sizes `dts` run for `steps` time-steps each, the observed `order` and the `orders` between successive step sizes, see `fit_order`. The round-off error of a run of `steps` steps is taken to be `100 sqrt(steps) eps`, and smaller errors are not fitted.
+
+    Attributes
+    ----------
+    name: str
+    dts: ndarray
+    steps: ndarray
+    errors: ndarray
+    wall_time: float. Time the study took in seconds.
+
+    """
+
+    def __init__(self, name, dts, steps, errors, wall_time):
+        idx = np.argsort(dts)
+        self.name = name
+        self.dts = dts[idx]
+        self.steps = steps[idx]
+        self.errors = errors[idx]
+        self.wall_time = wall_time
+        self.floor = 100.0 * np.sqrt(self.steps) * np.finfo(np.float64).eps
+        self.order, self.orders = fit_order(self.dts, self.errors, self.floor)
+
+
+    def report(self):
+        print("%s: observed order %.3f (%.2fs)" %(self.name, self.order, self.wall_time))
+        print("%12s %12s %12s %8s" %('dt', 'steps', 'error', 'order'))
+        for nn, (dt, steps, err, floor) in enumerate(zip(self.dts, self.steps, self.errors, self.floor)):
+            order = "%8.3f" %self.orders[nn-1] if nn > 0 else "%8s" %""
+            # the errors left out of the fit
+            note = "" if np.isfinite(err) and err > floor else " not fitted"
+            print("%12.3e %12i %12.3e %s%s" %(dt, steps, err, order, note))
+
+
+def convergence_study(stepper, dts, steps=None, T=None, norm='max', quantity='energy', workers=1, linear=None, block=1024):
+    """
+    Convergence study of the oscillator `stepper` over the step sizes `dts`. Every step size runs either for `steps` time-steps, as in the notebook of week 3, or until the time `T`, i.e. for the nearest whole number of steps. The errors are those of `integrate`.
+
+    Linear steppers, e.g. all those of `steppers.STEPPERS`, are vectorised: all step sizes are advanced at once, `block` steps at a time, with the powers of their step matrix. By default, a stepper is tested for linearity with `is_linear`. Other steppers are run one step size at a time on a pool of `workers` processes, the finest step sizes first.
+
+    Returns
+    -------
+    Convergence
+
+    """
+    if (steps is None) == (T is None):
+        raise ValueError("either the number of steps or the final time T has to be set")
+
+    dts = np.atleast_1d(np.asarray(dts, dtype=float))
+    if steps is None:
+        steps = np.rint(T / dts)
+    steps = np.broadcast_to(np.asarray(steps, dtype=int), dts.shape)
+    if linear is None:
+        linear = is_linear(stepper, dts)
+
+    tic = time.perf_counter()
+    if linear:
+        errors = integrate(stepper, dts, steps, norm, quantity, True, block)
+    elif workers > 1:
+        errors = np.empty(dts.shape)
+        order = np.argsort(-steps, kind='stable')
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(integrate, stepper, dts[i], steps[i], norm, quantity, False, block) for i in order]
+            for i, future in zip(order, futures):
+                errors[i] = future.result()
+    else:
+        errors = np.array([integrate(stepper, dt, nt, norm, quantity, False, block) for dt, nt in zip(dts, steps)])
+
+    return Convergence(getattr(stepper, '__name__', repr(stepper)), dts, steps, errors, time.perf_counter() - tic)
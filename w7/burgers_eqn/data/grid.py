@@ -0,0 +1,30 @@
+import numpy as np
+
+class sGrid(object):
+    """
+    Spatial grid of the finite volume method. `x` are the centres of the `Nx` cells, including one ghost cell at either end, and the cell width `dx` is a Python float.
+
+    Attributes
+    ----------
+    ud: UserData
+
+    """
+
+    def __init__(self, ud):
+        self.Nx = ud.Nx
+        self.xmin = ud.xmin
+        self.xmax = ud.xmax
+
+        self.x = np.linspace(self.xmin, self.xmax, self.Nx)
+        self.dx = float(self.x[1] - self.x[0])
+        self.shape = (self.Nx,)
+
+        # length of the inner domain, i.e. the period of periodic solutions
+        self.L = (self.Nx - 2) * self.dx
+
+
+class tGrid(object):
+    def __init__(self, ud):
+        self.T = ud.T
+        self.dt = ud.dt
+        self.t = np.arange(0.0, self.T+self.dt, self.dt)
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+import h5py
+import numpy as np
+
+class writer(object):
+    def __init__(self, folder='./output/', filename='burgers_eqn.h5'):
+        self.OUTPUT_FOLDER = folder
+        self.OUTPUT_FILENAME = filename
+        self.FILE_PATH = self.OUTPUT_FOLDER + '/' + self.OUTPUT_FILENAME
+
+        # If directory does not exist, create it.
+        if not os.path.exists(self.OUTPUT_FOLDER):
+            os.mkdir(self.OUTPUT_FOLDER)
+
+        # If file exists, rename it with old.
+        if os.path.exists(self.FILE_PATH):
+            os.rename(self.FILE_PATH, self.FILE_PATH+'_old')
+
+        file = h5py.File(self.FILE_PATH, 'a')
+        file.close()
+
+    def f(self):
+        file = h5py.File(self.FILE_PATH, 'r+')
+        return file
+
+    def write(self, time, name, data):
+        time = np.around(time, 4)
+        file = self.f()
+        file.create_dataset(str(time) + '/' + str(name), data=data, chunks=True, compression='gzip', compression_opts=4)
+        file.close()
+
+    def write_attr(self,obj):
+        file = self.f()
+        for key, value in vars(obj).items():
+            try:
+                file.attrs.create(key,value)
+            except:
+                file.attrs.create(key,repr(value),dtype='<S' + str(len(repr(value))))
+        file.close()
+
+
+
+def get_args(argv=None):
+    """
+    Argument parser for initial conditions and userdata file. The parsed arguments are returned alongside, so that the run options can be passed on. `argv` defaults to the command line arguments.
+
+    """
+
+    parser = argparse.ArgumentParser(description="Python solver for the Burgers' equation")
+
+    parser.add_argument('-ic', '--initial_conditions', action='store', dest='ic', help='<Required> Set initial conditions', required=True, choices={'gauss', 'sine', 'random'})
+    parser.add_argument('--adaptive', action='store_true', dest='adaptive', help='Choose the time-step of every solution from its CFL number')
+    parser.add_argument('--every', action='store', dest='every', type=int, default=10, help='Set the number of time-steps between the outputs')
+    parser.add_argument('--set', action='store', dest='rewrite', type=json.loads, default={}, help='Rewrite user data parameters, a list gives one value per solution of the batch, e.g. \'{"nu": [0.0, 1e-3, 1e-2], "flux": "local"}\'')
+
+    args = parser.parse_args(argv) # collect cmd line args
+    ic = args.ic
+
+    if   ic == 'gauss':
+        from input.gauss import UserData, sol_init
+    elif ic == 'sine':
+        from input.sine import UserData, sol_init
+    elif ic == 'random':
+        from input.random import UserData, sol_init
+
+    return UserData, sol_init, args
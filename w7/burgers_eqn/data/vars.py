@@ -0,0 +1,43 @@
+import numpy as np
+
+class Variables(object):
+    """
+    Solution container of the Burgers' equation. `u` has the shape `(..., Nx)`, where the leading axes `lead` hold a batch of solutions, e.g. of different initial conditions or viscosities, that are advanced together. `inner` is a view of the inner domain, and `west` and `east` are views of the ghost cells.
+
+    Attributes
+    ----------
+    sg: sGrid
+    lead: tuple, optional. Leading axes of the arrays, i.e. the batch.
+
+    """
+
+    def __init__(self, sg, lead=()):
+        self.setup(np.zeros(tuple(lead) + sg.shape))
+
+
+    def setup(self, u):
+        self.u = u
+        self.inner = u[..., 1:-1]
+        self.west, self.east = u[..., 0], u[..., -1]
+
+
+    def __getstate__(self):
+        # the views are rebuilt on unpickling and copying
+        return {'u' : self.u}
+
+
+    def __setstate__(self, state):
+        self.setup(state['u'])
+
+
+def batch_shape(*params):
+    """
+    Returns the shape of the batch of the user data parameters `params`, each either one value for all solutions or an array with one value per solution.
+
+    """
+    return np.broadcast_shapes(*(np.shape(param) for param in params))
+
+
+def batched(param, lead):
+    # the parameter of every solution of the batch `lead`, broadcast against the arrays of shape `lead + (Nx,)`
+    return np.broadcast_to(np.asarray(param, dtype=np.float64), lead)[..., np.newaxis]
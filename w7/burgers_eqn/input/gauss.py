@@ -0,0 +1,37 @@
+import numpy as np
+from data.vars import Variables, batch_shape, batched
+
+class UserData(object):
+    def __init__(self):
+
+        self.xmin = -3.0
+        self.xmax = 4.0
+        self.Nx = 1793                  # h = 1/256
+
+        self.dt = 0.5 / 256.0           # k = h/2
+        self.T = 3.0
+
+        # adaptive time-stepping
+        self.cfl = 0.5
+        self.dt_min = 1e-6
+        self.dt_max = 0.1
+
+        self.nu = 0.0                   # viscosity
+        self.flux = 'global'
+        self.bc = 'outflow'
+
+        # v(x) = amplitude * exp(-((x - centre) / width)^2),
+        # one value or one value per solution of the batch
+        self.amplitude = 1.0
+        self.width = 1.0
+        self.centre = 0.0
+
+
+def sol_init(sg, ud, rng=np.random):
+    lead = batch_shape(ud.amplitude, ud.width, ud.centre, ud.nu)
+    amplitude, width, centre = (batched(param, lead) for param in (ud.amplitude, ud.width, ud.centre))
+
+    sol = Variables(sg, lead)
+    sol.u[...] = amplitude * np.exp(-((sg.x - centre) / width)**2)
+
+    return sol
@@ -0,0 +1,41 @@
+import numpy as np
+from data.vars import Variables
+
+class UserData(object):
+    def __init__(self):
+
+        self.xmin = 0.0
+        self.xmax = 1.0
+        self.Nx = 514
+
+        self.dt = 0.0002
+        self.T = 0.5
+
+        # adaptive time-stepping
+        self.cfl = 0.5
+        self.dt_min = 1e-6
+        self.dt_max = 0.01
+
+        self.nu = 0.0                   # viscosity
+        self.flux = 'local'
+        self.bc = 'periodic'
+
+        # number of random profiles of the batch, made of the first `modes` Fourier modes,
+        # whose amplitudes decay as 1/k
+        self.members = 256
+        self.modes = 8
+
+
+def sol_init(sg, ud, rng=np.random):
+    lead = np.broadcast_shapes((ud.members,), np.shape(ud.nu))
+    k = np.arange(1, ud.modes + 1)
+    amplitude = rng.standard_normal(lead + (ud.modes,)) / k
+    phase = rng.uniform(0.0, 2.0 * np.pi, lead + (ud.modes,))
+
+    sol = Variables(sg, lead)
+    # periodic over the inner cells
+    x = 2.0 * np.pi * (sg.x - sg.x[1]) / sg.L
+    for mode in range(ud.modes):
+        sol.u += amplitude[..., mode, np.newaxis] * np.sin(k[mode] * x + phase[..., mode, np.newaxis])
+
+    return sol
@@ -0,0 +1,37 @@
+import numpy as np
+from data.vars import Variables, batch_shape, batched
+
+class UserData(object):
+    def __init__(self):
+
+        self.xmin = 0.0
+        self.xmax = 1.0
+        self.Nx = 514
+
+        self.dt = 0.001
+        self.T = 0.5
+
+        # adaptive time-stepping
+        self.cfl = 0.5
+        self.dt_min = 1e-6
+        self.dt_max = 0.01
+
+        self.nu = 0.0                   # viscosity
+        self.flux = 'local'
+        self.bc = 'periodic'
+
+        # v(x) = offset + amplitude * sin(2 pi x / L), one value or one value per solution of the batch.
+        # The inviscid solution forms a shock at t = L / (2 pi amplitude).
+        self.amplitude = 1.0
+        self.offset = 0.0
+
+
+def sol_init(sg, ud, rng=np.random):
+    lead = batch_shape(ud.amplitude, ud.offset, ud.nu)
+    amplitude, offset = (batched(param, lead) for param in (ud.amplitude, ud.offset))
+
+    sol = Variables(sg, lead)
+    # periodic over the inner cells
+    sol.u[...] = offset + amplitude * np.sin(2.0 * np.pi * (sg.x - sg.x[1]) / sg.L)
+
+    return sol
@@ -0,0 +1,59 @@
+import numpy as np
+from data.grid import sGrid, tGrid
+from input.user_data import UserDataInit
+from numerics.lax_friedrichs import LaxFriedrichs
+from numerics.cfl import CFL, AdaptiveTimeStep
+from data import io
+
+
+def run(ud, sol_init, args, folder='./output/', filename='burgers_eqn.h5'):
+    """
+    Runs the Burgers' solver for the user data `ud` and initial conditions `sol_init` with the options `args` from `io.get_args`, and writes the output to `folder/filename`. All solutions of the batch are advanced together, the output `u` has the shape `(..., Nx)`.
+
+    """
+    writer = io.writer(folder=folder, filename=filename)
+
+    sg = sGrid(ud)
+    tg = tGrid(ud)
+    writer.write_attr(sg)
+    writer.write_attr(tg)
+    # the parameters of the batch
+    writer.write_attr(ud)
+
+    sol = sol_init(sg, ud)
+    lax_friedrichs = LaxFriedrichs(sg, ud, sol.u.shape)
+    cfl = CFL(sg, sol.u.shape)
+
+    if args.adaptive:
+        # outputs are written at the same times as with the fixed time-step, every solution has its own time
+        adaptive_dt = AdaptiveTimeStep(sg, ud, sol.u.shape)
+        t = np.zeros(sol.u.shape[:-1] + (1,))
+        for nn in range(0, len(tg.t), args.every):
+            steps = 0
+            while np.any(t < tg.t[nn]):
+                remaining = tg.t[nn] - t
+                tg.dt = adaptive_dt(sol, sg, ud, remaining)
+                lax_friedrichs(sol, tg, sg, ud)
+                # the last step before an output lands exactly on the output time
+                t = np.where(tg.dt == remaining, tg.t[nn], t + tg.dt)
+                steps += 1
+
+            writer.write(nn, 'u', sol.u)
+            print("time-step %i, %i steps; max(|u|) = %f" %(nn, steps, np.abs(sol.u).max()))
+
+    else:
+        for nn in range(len(tg.t)):
+            if nn % args.every == 0:
+                writer.write(nn, 'u', sol.u)
+                print("time-step %i; max(|u|) = %f, CFL = %.3f" %(nn, np.abs(sol.u).max(), cfl(sol, sg, ud, tg.dt).max()))
+
+            lax_friedrichs(sol, tg, sg, ud)
+
+    return sol
+
+
+if __name__ == '__main__':
+    user_data, sol_init, args = io.get_args()
+    ud = UserDataInit(**vars(user_data()))
+    ud.update_ud(args.rewrite)
+    run(ud, sol_init, args)
@@ -0,0 +1,10 @@
+import numpy as np
+
+def set_boundary(sol, kind='outflow'):
+    if kind == 'periodic':
+        sol.west[...] = sol.u[..., -2]
+        sol.east[...] = sol.u[..., 1]
+    else:
+        # the outflow BC extrapolates the inner solution with zero gradient
+        sol.west[...] = sol.u[..., 1]
+        sol.east[...] = sol.u[..., -2]
@@ -0,0 +1,57 @@
+import numpy as np
+from data.vars import batched
+
+
+class CFL(object):
+    """
+    Vectorised CFL monitor. Computes the CFL number `(max|u| + 2 nu / dx) dt / dx` of every solution of the batch, using a work buffer allocated for the grid `sg`, or for arrays of the given `shape`.
+
+    """
+
+    def __init__(self, sg, shape=None):
+        shape = sg.shape if shape is None else shape
+        self.tmp = np.empty(shape)
+
+    def speeds(self, sol, sg, ud):
+        # the largest signal speed of every solution, of shape `lead + (1,)`
+        np.abs(sol.u, out=self.tmp)
+        speed = self.tmp.max(axis=-1, keepdims=True)
+        # the viscosity restricts the time-step as a speed of 2 nu / dx
+        speed += 2.0 * batched(ud.nu, speed.shape[:-1]) / sg.dx
+
+        if not np.all(np.isfinite(speed)):
+            raise FloatingPointError("the solution is not finite, the run has become unstable")
+        return speed
+
+    def __call__(self, sol, sg, ud, dt):
+        return self.speeds(sol, sg, ud) * dt / sg.dx
+
+
+class AdaptiveTimeStep(object):
+    """
+    Chooses the time-step of every solution of the batch from its CFL number, such that it is `ud.cfl`, within the bounds `ud.dt_min` and `ud.dt_max`. The time-steps are shortened so that the next output time is reached exactly, and are zero for the solutions that have reached it. Unlike the ensembles of the shallow water solver, the solutions do not share the time-step, as the numerical diffusion of the Lax-Friedrichs scheme depends on it, so every solution is the same as if it were run on its own.
+
+    Attributes
+    ----------
+    sg: sGrid
+    ud: UserData
+    shape: tuple, optional
+
+    """
+
+    def __init__(self, sg, ud, shape=None):
+        self.monitor = CFL(sg, shape)
+        self.cfl = ud.cfl
+        self.dt_min = ud.dt_min
+        self.dt_max = ud.dt_max
+
+    def __call__(self, sol, sg, ud, remaining):
+        dt = self.cfl * sg.dx / self.monitor.speeds(sol, sg, ud)
+
+        if np.any(dt < self.dt_min):
+            raise RuntimeError("the time-step %.3e required by CFL = %.2f is below dt_min = %.3e" %(dt.min(), self.cfl, self.dt_min))
+        dt = np.minimum(dt, self.dt_max)
+
+        # split the remaining time until the next output into steps of equal size
+        nsteps = np.ceil(remaining / dt)
+        return np.divide(remaining, nsteps, out=np.zeros_like(dt), where=nsteps > 0)
@@ -43,13 +43,14 @@ class writer(object):
 
 def get_args():
     """
-    Argument parser for initial conditions and userdata file.
+    Argument parser for initial conditions and userdata file. The parsed arguments are returned alongside, so that the run options can be passed on.
 
     """
 
     parser = argparse.ArgumentParser(description='Python solver for the heat equation')
 
     parser.add_argument('-ic', '--initial_conditions', action='store', dest='ic', help='<Required> Set initial conditions', required=True,choices={'random', 'block', 'gauss'})
+    parser.add_argument('-ts', '--time_stepper', action='store', dest='ts', help='Set the time integrator', default='expl_mdpt', choices={'expl_mdpt', 'adi'})
 
     args = parser.parse_args() # collect cmd line args
     ic = args.ic
@@ -63,7 +64,7 @@ def get_args():
     elif ic == 'gauss':
         from input.gauss import UserData, sol_init
 
-    return UserData, sol_init
+    return UserData, sol_init, args
 
 
 
@@ -1,10 +1,15 @@
 from data.grid import sGrid, tGrid
-from numerics.expl_mdpt import time_update
 from data import io
 
 
 if __name__ == '__main__':
-    user_data, sol_init = io.get_args()
+    user_data, sol_init, args = io.get_args()
+
+    if args.ts == 'adi':
+        from numerics.adi import time_update
+    else:
+        from numerics.expl_mdpt import time_update
+
     ud = user_data()
 
     writer = io.writer()
@@ -0,0 +1,60 @@
+import numpy as np
+from numerics.laplacian import Laplacian
+from tqdm import tqdm
+
+
+class ADI(object):
+    """
+    Crank-Nicolson time integrator for the heat equation in the alternating direction implicit (ADI) form of Douglas. For every axis k, an implicit system `(1 - dt/2 D_k) v = rhs` with the periodic second difference `D_k` is solved. In 1D, this is the Crank-Nicolson scheme. The scheme is unconditionally stable and second order in time.
+
+    The periodic systems are circulant, so they are diagonalised by the FFT along the axis. The eigenvalues of `1 - dt/2 D_k` are computed once and cached.
+
+    Attributes
+    ----------
+    shape: tuple
+    dxy: tuple, grid spacing along every axis
+    dt: float
+
+    """
+
+    def __init__(self, shape, dxy, dt):
+        self.dxy = dxy[:len(shape)]
+        self.dt = dt
+
+        self.laplacian = Laplacian(shape, dxy)
+        self.Du = [np.empty(shape) for _ in self.dxy]
+
+        self.eigvals = []
+        for axis, (n, dx) in enumerate(zip(shape, self.dxy)):
+            m = np.arange(n//2 + 1)
+            # eigenvalues of D_k are -(2 - 2 cos(2 pi m / n)) / dx**2
+            lam = 1.0 + 0.5 * dt * (2.0 - 2.0 * np.cos(2.0 * np.pi * m / n)) / dx**2
+            bshape = [1] * len(shape)
+            bshape[axis] = -1
+            self.eigvals.append(lam.reshape(bshape))
+
+    def solve(self, rhs, axis):
+        n = rhs.shape[axis]
+        return np.fft.irfft(np.fft.rfft(rhs, axis=axis) / self.eigvals[axis], n=n, axis=axis)
+
+    def step(self, u):
+        dt = self.dt
+        self.laplacian.refresh(u)
+        Du = [self.laplacian.diff(axis, out) for axis, out in enumerate(self.Du)]
+
+        # (1 - dt/2 D_0) v = (1 + dt/2 D_0 + dt sum_k>0 D_k) u
+        v = self.solve(u + 0.5 * dt * Du[0] + dt * sum(Du[1:]), 0)
+
+        # (1 - dt/2 D_k) v_k = v_k-1 - dt/2 D_k u
+        for axis in range(1, u.ndim):
+            v = self.solve(v - 0.5 * dt * Du[axis], axis)
+
+        return v
+
+
+def time_update(sol, tg, sg, writer):
+    adi = ADI(sol.u.shape, sg.dxy, tg.dt)
+    for time in tqdm(tg.t):
+        sol.u[...] = adi.step(sol.u)
+
+        writer.write(time, 'u', sol.u)
@@ -1,12 +1,16 @@
 import numpy as np
-from numerics.ctr_diff import rhs
+from numerics.laplacian import Laplacian
 from tqdm import tqdm
 
 
 def time_update(sol, tg, sg, writer):
+    laplacian = Laplacian(sol.u.shape, sg.dxy)
+    laplacian.attach(sol)
+
+    u0 = np.empty_like(sol.u)
     for time in tqdm(tg.t):
-        u0 = np.copy(sol.u)
-        sol.u[...] = u0 + 0.5 * tg.dt * rhs(sol, sg.dxy)
-        sol.u[...] = u0 + tg.dt * rhs(sol, sg.dxy)
+        u0[...] = sol.u
+        sol.u[...] = u0 + 0.5 * tg.dt * laplacian(sol.u, sol.fu)
+        sol.u[...] = u0 + tg.dt * laplacian(sol.u, sol.fu)
 
-        writer.write(time, 'u', sol.u)
\ No newline at end of file
+        writer.write(time, 'u', sol.u)